@@ -0,0 +1,107 @@
+"""허용 목록 저장 형식(v1 dict / v2 압축 리스트) 비교 벤치마크
+
+discord.py와 Red-DiscordBot이 설치된 환경에서 레포 루트 기준으로 실행한다.
+
+    python -m bench.bench_allowlist --entries 10000
+
+합성 길드 하나를 두 형식으로 만들어 직렬화 크기, JSON 파싱 시간, 메모리 인덱스를 만드는 시간과
+그 인덱스가 차지하는 메모리를 비교한다. v1은 예전 저장소처럼 파싱한 dict-of-dicts를 그대로
+인덱스로 들고 있고, v2는 AllowlistStore가 로드해 AllowRecord로 푼 인덱스를 잰다.
+v2는 크기와 메모리에서 이기고 인덱스 구축 시간에서는 진다. 두 쪽을 모두 보고 판단한다.
+"""
+
+import argparse
+import asyncio
+import copy
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, Optional, Sequence
+
+from botgate.storage import ALLOWLIST_GROUP, SCHEMA_KEY, AllowlistStore
+
+from .fakes import FakeConfig, snowflake
+
+
+def _rows(entries: int, version: int) -> Dict[str, Any]:
+    approver = snowflake()
+    rows: Dict[str, Any] = {}
+    for index in range(entries):
+        approved_at = 1_700_000_000 + index
+        if version == 1:
+            record: Any = {"approved_by": approver, "approved_at": f"2023-11-14T22:{index % 60:02d}:00+00:00"}
+        else:
+            record = [approver, approved_at]
+        rows[str(snowflake())] = record
+    if version == 2:
+        rows[SCHEMA_KEY] = 2
+    return rows
+
+
+async def _index_v1(guild_id: int, rows: Dict[str, Any]) -> Any:
+    # 예전 저장소: Config에서 읽은 행(복사본)을 봇 ID만 int로 바꿔 그대로 보관했다.
+    return {int(bot_key): record for bot_key, record in copy.deepcopy(rows).items()}
+
+
+async def _index_v2(guild_id: int, rows: Dict[str, Any]) -> Any:
+    config = FakeConfig()
+    config.init_custom(ALLOWLIST_GROUP, 1)
+    config.seed(("CUSTOM", ALLOWLIST_GROUP, guild_id), rows)
+    store = AllowlistStore(config)
+    await store.load()
+    store.count(guild_id)
+    # 메모리 측정에 FakeConfig가 들고 있는 원본 행이 섞이지 않게 끊는다.
+    store.config = None
+    return store
+
+
+async def _measure(label: str, rows: Dict[str, Any], repeat: int, build_index) -> None:
+    guild_id = snowflake()
+    payload = json.dumps({str(guild_id): rows}, separators=(",", ":"))
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        json.loads(payload)
+    parse_ms = (time.perf_counter() - started) / repeat * 1000
+
+    index_ms = 0.0
+    for _ in range(repeat):
+        parsed = json.loads(payload)[str(guild_id)]
+        started = time.perf_counter()
+        await build_index(guild_id, parsed)
+        index_ms += (time.perf_counter() - started) * 1000
+    index_ms /= repeat
+
+    # 인덱스가 들고 있는 메모리만 잰다. 파싱 결과는 인덱스를 만든 뒤 버린다.
+    parsed = json.loads(payload)[str(guild_id)]
+    gc.collect()
+    tracemalloc.start()
+    index = await build_index(guild_id, parsed)
+    del parsed
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del index
+
+    print(
+        f"{label:<4} serialized {len(payload) / 1024:9.1f}KiB   json.loads {parse_ms:7.2f}ms   "
+        f"build index {index_ms:7.2f}ms   index {memory / 1024:9.1f}KiB"
+    )
+
+
+async def run(entries: int, repeat: int) -> None:
+    await _measure("v1", _rows(entries, 1), repeat, _index_v1)
+    await _measure("v2", _rows(entries, 2), repeat, _index_v2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.entries, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
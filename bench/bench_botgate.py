@@ -0,0 +1,333 @@
+"""BotGate 오프라인 벤치마크
+
+discord.py와 Red-DiscordBot이 설치된 환경에서 레포 루트 기준으로 실행한다.
+네트워크나 Discord 연결은 사용하지 않는다.
+
+    python -m bench.bench_botgate --scenario join --guilds 50 --events 2000 --rate 500
+    python -m bench.bench_botgate --scenario approve --events 500
+    python -m bench.bench_botgate --scenario restore --guilds 2000 --pending 20
+
+변경 전후를 같은 인자로 돌려 p50/p99 지연, 처리량, 이벤트당 Config 읽기/쓰기 수,
+이벤트당 REST 호출 수를 비교한다.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import botgate.botgate as botgate_module
+from botgate.botgate import ApproveButton, BotGate, RaidSummaryLayoutView
+
+from .fakes import (
+    FakeBot,
+    FakeConfig,
+    FakeGuild,
+    FakeInteraction,
+    FakeMessage,
+    FakeRest,
+    FakeUser,
+    IOStats,
+    snowflake,
+)
+
+
+# approve 시나리오에서 레이드 길드의 감지 기준
+RAID_BURST = 5
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Harness:
+    """가짜 봇과 길드, 설정이 채워진 FakeConfig 위에 cog 하나를 올린다."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.stats = IOStats()
+        self.rest = FakeRest(self.stats, latency=args.rest_latency / 1000)
+        self.bot = FakeBot(self.rest)
+        self.guilds: List[FakeGuild] = []
+        self.allowed: Dict[int, List[int]] = {}
+        self.cog: Optional[BotGate] = None
+
+    async def setup(self, *, pending_per_guild: int = 0, load: bool = True, raid_guilds: int = 0) -> BotGate:
+        """``raid_guilds``가 있으면 앞쪽 그만큼의 길드는 1초 창에 RAID_BURST개부터 레이드로 보고, 나머지는 레이드 감지를 끈다."""
+        botgate_module.Config = FakeConfig
+        # 저널 같은 cog 데이터 파일은 실행마다 새 임시 폴더에 둔다.
+        data_path = Path(tempfile.mkdtemp(prefix="botgate-bench-"))
+        botgate_module.cog_data_path = lambda cog: data_path
+        cog = BotGate(self.bot)
+        self.bot.register_cog("BotGate", cog)
+        config: FakeConfig = cog.config
+        # 설정 I/O와 REST 호출을 같은 카운터에 모은다.
+        config.stats = self.stats
+        for index in range(self.args.guilds):
+            guild = FakeGuild(self.rest, name=f"guild-{index}")
+            for _ in range(self.args.members):
+                guild.add_member()
+            self.bot.add_guild(guild)
+            self.guilds.append(guild)
+            config.seed(("GUILD", guild.id, "enabled"), True)
+            config.seed(("GUILD", guild.id, "log_channel_id"), guild.log_channel.id)
+            if raid_guilds:
+                raid = index < raid_guilds
+                config.seed(("GUILD", guild.id, "raid_threshold"), RAID_BURST if raid else 0)
+                config.seed(("GUILD", guild.id, "raid_window_seconds"), 1)
+            allowed = [snowflake() for _ in range(self.args.allowlist)]
+            self.allowed[guild.id] = allowed
+            config.seed(
+                ("CUSTOM", "ALLOWLIST", guild.id),
+                {
+                    str(bot_id): {"approved_by": guild.owner_id, "approved_at": "2024-01-01T00:00:00+00:00"}
+                    for bot_id in allowed
+                },
+            )
+            if pending_per_guild:
+                config.seed(
+                    ("GUILD", guild.id, "pending_approvals"),
+                    [{"bot_id": snowflake(), "message_id": snowflake()} for _ in range(pending_per_guild)],
+                )
+        self.cog = cog
+        if load:
+            await cog.cog_load()
+        self.stats.reset()
+        return cog
+
+    async def teardown(self) -> None:
+        if self.cog is not None:
+            await self.cog.cog_unload()
+
+
+async def settle(cog: BotGate) -> None:
+    """킥 대기열과 로그 디스패처가 모두 빌 때까지 기다린다. teardown 전에 불러야 남은 킥이 취소되지 않는다."""
+    while not (all(queue.idle for queue in cog._kick_queues.values()) and cog._log_dispatcher.idle):
+        await asyncio.sleep(0.01)
+
+
+async def _paced(events: int, rate: float, handler) -> Tuple[List[float], float]:
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for index in range(events):
+        if rate > 0:
+            delay = started + index / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        t0 = time.perf_counter()
+        await handler(index)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - started
+
+
+async def run_join(args: argparse.Namespace) -> dict:
+    harness = Harness(args)
+    cog = await harness.setup()
+    rng = random.Random(args.seed)
+    joined = []
+
+    async def handler(_: int) -> None:
+        guild = rng.choice(harness.guilds)
+        if rng.random() < args.allowed_ratio and harness.allowed[guild.id]:
+            member = guild.add_member(bot=True, user_id=rng.choice(harness.allowed[guild.id]))
+        else:
+            member = guild.add_member(bot=True)
+        member.joined_at_perf = time.perf_counter()
+        joined.append(member)
+        await cog.on_member_join(member)
+
+    latencies, elapsed = await _paced(args.events, args.rate, handler)
+    await settle(cog)
+    await harness.teardown()
+    kick_latencies = [
+        member.kicked_at_perf - member.joined_at_perf
+        for member in joined
+        if member.kicked_at_perf is not None
+    ]
+    return {
+        "latencies": latencies,
+        "elapsed": elapsed,
+        "events": args.events,
+        "stats": harness.stats,
+        "extra": {"time-to-kick": kick_latencies},
+    }
+
+
+def _walk_components(components: Sequence[Any]) -> Iterator[Any]:
+    for component in components:
+        yield component
+        yield from _walk_components(getattr(component, "children", ()))
+        accessory = getattr(component, "accessory", None)
+        if accessory is not None:
+            yield accessory
+
+
+def _approve_buttons(message: FakeMessage) -> List[Any]:
+    return [
+        component
+        for component in _walk_components(message.components)
+        if ApproveButton.__discord_ui_compiled_template__.fullmatch(getattr(component, "custom_id", None) or "")
+    ]
+
+
+async def run_approve(args: argparse.Namespace) -> dict:
+    """실제 감지 알림과 레이드 요약 메시지에 붙은 승인 버튼을 누른다.
+
+    앞쪽 ``--raid-guilds``개 길드는 짧은 창에 봇이 몰려 레이드 요약을 받고, 나머지는 레이드 감지를
+    꺼 봇마다 감지 알림을 받는다. 준비 단계는 재지 않고, 클릭부터 알림 수정까지만 잰다.
+    Config/REST 카운터도 클릭부터 센다.
+    """
+    harness = Harness(args)
+    cog = await harness.setup(raid_guilds=args.raid_guilds)
+    for index in range(args.events):
+        guild = harness.guilds[index % len(harness.guilds)]
+        await cog.on_member_join(guild.add_member(bot=True))
+    await settle(cog)
+    # 레이드 요약은 창이 조용해진 뒤에 올라온다.
+    while any(raid.summary_task is not None and not raid.summary_task.done() for raid in cog._raids.values()):
+        await asyncio.sleep(0.05)
+    await settle(cog)
+
+    clicks: List[Tuple[FakeGuild, FakeMessage, Any]] = []
+    for guild in harness.guilds:
+        for message in list(guild.log_channel.messages.values()):
+            clicks.extend((guild, message, button) for button in _approve_buttons(message))
+    random.Random(args.seed).shuffle(clicks)
+    harness.stats.reset()
+    sources: List[str] = []
+    completions = []
+
+    async def handler(index: int) -> None:
+        guild, message, button = clicks[index]
+        interaction = FakeInteraction(harness.bot, guild, FakeUser(guild.owner_id, name="owner"), message)
+        match = ApproveButton.__discord_ui_compiled_template__.fullmatch(button.custom_id)
+        item = await ApproveButton.from_custom_id(interaction, button, match)
+        await item.callback(interaction)
+        sources.append("summary" if isinstance(message.view, RaidSummaryLayoutView) else "alert")
+        completions.append(interaction)
+
+    latencies, elapsed = await _paced(len(clicks), args.rate, handler)
+    # 버튼은 응답만 하고 승인은 백그라운드에서 끝나므로 완료까지 기다린다.
+    while cog._approval_tasks:
+        await asyncio.gather(*cog._approval_tasks.values(), return_exceptions=True)
+    await settle(cog)
+    await harness.teardown()
+    ack = [
+        i.response.acked_at_perf - i.created_at_perf
+        for i in completions
+        if i.response.acked_at_perf is not None
+    ]
+    complete = {
+        source: [
+            i.completed_at_perf - i.created_at_perf
+            for i, kind in zip(completions, sources)
+            if kind == source and i.completed_at_perf is not None
+        ]
+        for source in ("alert", "summary")
+    }
+    left = sum(
+        len(_approve_buttons(message)) for guild in harness.guilds for message in guild.log_channel.messages.values()
+    )
+    return {
+        "latencies": latencies,
+        "elapsed": elapsed,
+        "events": len(clicks),
+        "stats": harness.stats,
+        "extra": {
+            "click-to-ack": ack,
+            "alert click-to-complete": complete["alert"],
+            "summary click-to-complete": complete["summary"],
+        },
+        "counts": {
+            "alert buttons": sources.count("alert"),
+            "summary buttons": sources.count("summary"),
+            "buttons left": left,
+            "new approval logs": harness.stats.counts["rest:send_message"],
+        },
+    }
+
+
+async def run_restore(args: argparse.Namespace) -> dict:
+    latencies: List[float] = []
+    stats = IOStats()
+    started = time.perf_counter()
+    for _ in range(args.iterations):
+        harness = Harness(args)
+        harness.stats = stats
+        harness.rest.stats = stats
+        cog = await harness.setup(pending_per_guild=args.pending, load=False)
+        cog._settings = dict(await cog.config.all_guilds())
+        await cog._pending.load()
+        t0 = time.perf_counter()
+        await cog._restore_pending_views()
+        latencies.append(time.perf_counter() - t0)
+    return {
+        "latencies": latencies,
+        "elapsed": time.perf_counter() - started,
+        "events": args.iterations,
+        "stats": stats,
+        "extra": {},
+    }
+
+
+SCENARIOS = {"join": run_join, "approve": run_approve, "restore": run_restore}
+
+
+def report(name: str, result: dict) -> None:
+    latencies = result["latencies"]
+    events = max(1, result["events"])
+    stats: IOStats = result["stats"]
+    print(f"scenario={name} events={result['events']}")
+    print(
+        f"  latency   p50={percentile(latencies, 50) * 1e6:9.1f}us "
+        f"p99={percentile(latencies, 99) * 1e6:9.1f}us"
+    )
+    print(f"  throughput {result['events'] / result['elapsed']:.1f} events/s")
+    for label, samples in result["extra"].items():
+        print(
+            f"  {label:<26} p50={percentile(samples, 50) * 1e6:9.1f}us "
+            f"p99={percentile(samples, 99) * 1e6:9.1f}us (n={len(samples)})"
+        )
+    print(
+        f"  config    reads/event={stats.counts['config_read'] / events:.3f} "
+        f"writes/event={stats.counts['config_write'] / events:.3f}"
+    )
+    for label, count in result.get("counts", {}).items():
+        print(f"  {label:<22}{count}")
+    print(f"  rest      calls/event={stats.rest_total() / events:.3f}")
+    for key in sorted(k for k in stats.counts if k.startswith("rest:")):
+        print(f"    {key[5:]:<22}{stats.counts[key] / events:.3f}")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="join")
+    parser.add_argument("--guilds", type=int, default=10)
+    parser.add_argument("--members", type=int, default=100, help="길드당 일반 멤버 수")
+    parser.add_argument("--allowlist", type=int, default=100, help="길드당 허용 목록 크기")
+    parser.add_argument("--pending", type=int, default=20, help="restore: 길드당 승인 대기 수")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5, help="restore 반복 횟수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 이벤트 수(0이면 최대 속도)")
+    parser.add_argument("--allowed-ratio", type=float, default=0.2, help="join: 허용된 봇 비율")
+    parser.add_argument("--raid-guilds", type=int, default=2, help="approve: 레이드 요약을 받는 길드 수")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="가짜 REST 지연(ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    result = asyncio.run(SCENARIOS[args.scenario](args))
+    report(args.scenario, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""BotGate 레이아웃 view 생성 비용 마이크로벤치마크
+
+discord.py가 설치된 환경에서 레포 루트 기준으로 실행한다.
+
+    python -m bench.bench_layout --iterations 5000
+
+매번 BotGateLayoutView를 새로 만드는 경우와 LayoutTemplate.static()을 쓰는 경우의
+view 하나당 생성 시간과 직렬화(to_components) 시간을 비교한다. render()는 매번 새 view를
+만들므로 직접 만드는 것과 비용이 같아야 하며, 그 기준선으로 함께 출력한다.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Optional, Sequence
+
+import discord
+
+from botgate.botgate import APPROVED_JOIN, HELP, BotGateLayoutView
+
+
+def _measure(label: str, iterations: int, build: Callable[[], discord.ui.LayoutView]) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    build_us = (time.perf_counter() - started) / iterations * 1e6
+
+    view = build()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        view.to_components()
+    serialize_us = (time.perf_counter() - started) / iterations * 1e6
+    print(f"{label:<34} build {build_us:8.2f}us/view   to_components {serialize_us:8.2f}us/view")
+
+
+async def run(iterations: int) -> None:
+    help_lines = list(HELP.lines or [])
+
+    _measure(
+        "help: fresh BotGateLayoutView",
+        iterations,
+        lambda: BotGateLayoutView(
+            title=HELP.title,
+            lines=help_lines,
+            accent_color=HELP.accent_color,
+            use_container=True,
+        ),
+    )
+    _measure("help: LayoutTemplate.static()", iterations, HELP.static)
+    _measure(
+        "approved join: fresh view",
+        iterations,
+        lambda: BotGateLayoutView(
+            title=APPROVED_JOIN.title,
+            lines=["example-bot(`123456789012345678`)"],
+            accent_color=APPROVED_JOIN.accent_color,
+            use_container=True,
+        ),
+    )
+    _measure(
+        "approved join: render() (baseline)",
+        iterations,
+        lambda: APPROVED_JOIN.render(["example-bot(`123456789012345678`)"]),
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
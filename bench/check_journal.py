@@ -0,0 +1,126 @@
+"""write-behind 저널 크래시 복구 회귀 검사
+
+discord.py와 Red-DiscordBot이 설치된 환경에서 레포 루트 기준으로 실행한다.
+
+    python -m bench.check_journal
+
+저널에 쓰기를 남긴 뒤 close() 없이 버리는 것으로 크래시를 흉내 내고, 같은 Config와 저널 파일로
+다시 열어 허용 목록이 기대한 상태인지 확인한다. 어긋나면 0이 아닌 코드로 끝난다.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from botgate.storage import ALLOWLIST_GROUP, AllowlistStore, AllowRecord, WriteBehindJournal, _try_lock
+
+from .fakes import FakeConfig
+
+GUILD_ID = 1000
+RECORD = AllowRecord(1, 1_700_000_000)
+
+
+async def _open(config: FakeConfig, path: str) -> Tuple[AllowlistStore, WriteBehindJournal]:
+    store = AllowlistStore(config)
+    journal = WriteBehindJournal()
+    journal.attach(store)
+    await store.load()
+    await journal.open(path)
+    return store, journal
+
+
+def _crash(journal: WriteBehindJournal) -> None:
+    # close() 없이 버린다. 이미 맡긴 파일 쓰기는 끝난 것으로 본다(커널 버퍼까지는 내려간 상태).
+    if journal._last_io is not None:
+        journal._last_io.result()
+    # 죽은 프로세스의 파일 잠금은 OS가 푼다.
+    journal._lock.close()
+
+
+async def _bulk_deny_survives_restart(config: FakeConfig, path: str) -> List[int]:
+    store, journal = await _open(config, path)
+    await store.add(GUILD_ID, 1, RECORD)
+    await store.add(GUILD_ID, 2, RECORD)
+    await store.replace_guild(GUILD_ID, {})
+    _crash(journal)
+    store, journal = await _open(config, path)
+    return sorted(store.for_guild(GUILD_ID))
+
+
+async def _write_after_replace_survives_restart(config: FakeConfig, path: str) -> List[int]:
+    store, journal = await _open(config, path)
+    await store.add(GUILD_ID, 1, RECORD)
+    await store.replace_guild(GUILD_ID, {2: RECORD})
+    await store.add(GUILD_ID, 3, RECORD)
+    _crash(journal)
+    store, journal = await _open(config, path)
+    return sorted(store.for_guild(GUILD_ID))
+
+
+async def _unflushed_add_survives_restart(config: FakeConfig, path: str) -> List[int]:
+    store, journal = await _open(config, path)
+    await store.add(GUILD_ID, 1, RECORD)
+    _crash(journal)
+    store, journal = await _open(config, path)
+    return sorted(store.for_guild(GUILD_ID))
+
+
+def _other_journal(path: str, pid: int, bot_ids: List[int]) -> str:
+    root, ext = os.path.splitext(path)
+    other = f"{root}.{pid}{ext}"
+    with open(other, "w", encoding="utf-8") as fp:
+        for bot_id in bot_ids:
+            fp.write(json.dumps([ALLOWLIST_GROUP, GUILD_ID, bot_id, RECORD.encode()]) + "\n")
+    return other
+
+
+async def _dead_process_journal_is_adopted(config: FakeConfig, path: str) -> List[int]:
+    other = _other_journal(path, 1, [4])
+    store, journal = await _open(config, path)
+    await journal.close()
+    return sorted(store.for_guild(GUILD_ID)) if not os.path.exists(other) else [-1]
+
+
+async def _live_process_journal_is_left_alone(config: FakeConfig, path: str) -> List[int]:
+    # 같은 데이터 폴더를 쓰는 다른 프로세스가 아직 반영하지 않은 줄
+    other = _other_journal(path, 2, [5])
+    lock = _try_lock(other)
+    store, journal = await _open(config, path)
+    await store.replace_guild(GUILD_ID, {6: RECORD})
+    await journal.close()
+    with open(other, encoding="utf-8") as fp:
+        kept = len(fp.readlines())
+    lock.close()
+    return sorted(store.for_guild(GUILD_ID)) if kept == 1 else [-1]
+
+
+CASES: List[Tuple[str, Callable, List[int]]] = [
+    ("bulk deny stays denied after crash", _bulk_deny_survives_restart, []),
+    ("write after bulk replace survives crash", _write_after_replace_survives_restart, [2, 3]),
+    ("unflushed add survives crash", _unflushed_add_survives_restart, [1]),
+    ("dead process journal is replayed and removed", _dead_process_journal_is_adopted, [4]),
+    ("live process journal is left alone", _live_process_journal_is_left_alone, [6]),
+]
+
+
+async def run() -> int:
+    failures = 0
+    for label, case, expected in CASES:
+        config = FakeConfig()
+        path = os.path.join(tempfile.mkdtemp(prefix="botgate-journal-"), "writes.journal")
+        got = await case(config, path)
+        ok = got == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}: expected {expected}, got {got}")
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    sys.exit(1 if asyncio.run(run()) else 0)
+
+
+if __name__ == "__main__":
+    main()
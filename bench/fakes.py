@@ -0,0 +1,520 @@
+"""BotGate 오프라인 벤치마크용 가짜 Red/discord 객체
+
+네트워크나 Discord 연결 없이 cog를 구동하기 위한 최소한의 대역이다.
+Config 읽기/쓰기와 REST 호출은 모두 하나의 IOStats에 기록된다.
+"""
+
+import asyncio
+import copy
+import itertools
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import discord
+from discord.components import _component_factory
+
+_MISSING = object()
+_snowflakes = itertools.count(100_000_000_000_000_000)
+
+
+def snowflake() -> int:
+    return next(_snowflakes)
+
+
+class IOStats:
+    """config_read / config_write / rest:<route> 단위 호출 수"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def hit(self, key: str) -> None:
+        self.counts[key] += 1
+
+    def reset(self) -> None:
+        self.counts.clear()
+
+    def rest_total(self) -> int:
+        return sum(count for key, count in self.counts.items() if key.startswith("rest:"))
+
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+
+class FakeValue:
+    def __init__(self, config: "FakeConfig", path: Tuple[str, ...], default: Any = None):
+        self._config = config
+        self._path = path
+        self._default = default
+
+    def __call__(self):
+        return self._read()
+
+    async def _read(self):
+        self._config.stats.hit("config_read")
+        return copy.deepcopy(self._config._get(self._path, self._default))
+
+    async def set(self, value: Any) -> None:
+        self._config.stats.hit("config_write")
+        self._config._set(self._path, copy.deepcopy(value))
+
+    async def clear(self) -> None:
+        self._config.stats.hit("config_write")
+        self._config._delete(self._path)
+
+
+class FakeGroup(FakeValue):
+    def __init__(self, config: "FakeConfig", path: Tuple[str, ...], defaults: Dict[str, Any]):
+        super().__init__(config, path, defaults)
+        self._defaults = defaults
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get_attr(name)
+
+    def get_attr(self, key: Any) -> FakeValue:
+        key = str(key)
+        default = self._defaults.get(key)
+        if isinstance(default, dict):
+            return FakeGroup(self._config, self._path + (key,), default)
+        return FakeValue(self._config, self._path + (key,), copy.deepcopy(default))
+
+    async def _read(self):
+        return await self.all()
+
+    async def all(self) -> Dict[str, Any]:
+        self._config.stats.hit("config_read")
+        merged = copy.deepcopy(self._defaults)
+        merged.update(copy.deepcopy(self._config._get(self._path, {})))
+        return merged
+
+    async def set(self, value: Dict[str, Any]) -> None:
+        if not isinstance(value, dict):
+            raise ValueError("You may only set the value of a group to be a dict.")
+        await super().set(value)
+
+    async def get_raw(self, *path: Any, default: Any = _MISSING) -> Any:
+        self._config.stats.hit("config_read")
+        value = self._config._get(self._path + tuple(str(p) for p in path), _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(path)
+            return default
+        return copy.deepcopy(value)
+
+    async def set_raw(self, *path: Any, value: Any) -> None:
+        self._config.stats.hit("config_write")
+        self._config._set(self._path + tuple(str(p) for p in path), copy.deepcopy(value))
+
+    async def clear_raw(self, *path: Any) -> None:
+        self._config.stats.hit("config_write")
+        self._config._delete(self._path + tuple(str(p) for p in path))
+
+
+class FakeConfig:
+    """redbot.core.Config의 메모리 대역. 실제 드라이버처럼 값을 복사해서 주고받는다."""
+
+    def __init__(self):
+        self.stats = IOStats()
+        self._data: Dict[str, Any] = {}
+        self._defaults: Dict[str, Dict[str, Any]] = {"GLOBAL": {}, "GUILD": {}}
+        self.custom_groups: Dict[str, int] = {}
+
+    @classmethod
+    def get_conf(cls, cog: Any, identifier: int, force_registration: bool = False, **kwargs):
+        return cls()
+
+    def register_global(self, **defaults: Any) -> None:
+        self._defaults["GLOBAL"].update(defaults)
+
+    def register_guild(self, **defaults: Any) -> None:
+        self._defaults["GUILD"].update(defaults)
+
+    def init_custom(self, group: str, identifier_count: int) -> None:
+        self.custom_groups[group] = identifier_count
+        self._defaults.setdefault(group, {})
+
+    def register_custom(self, group: str, **defaults: Any) -> None:
+        self._defaults.setdefault(group, {}).update(defaults)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeGroup(self, ("GLOBAL",), self._defaults["GLOBAL"]).get_attr(name)
+
+    async def all(self) -> Dict[str, Any]:
+        return await FakeGroup(self, ("GLOBAL",), self._defaults["GLOBAL"]).all()
+
+    def guild(self, guild: Any) -> FakeGroup:
+        return self.guild_from_id(guild.id)
+
+    def guild_from_id(self, guild_id: int) -> FakeGroup:
+        return FakeGroup(self, ("GUILD", str(guild_id)), self._defaults["GUILD"])
+
+    def custom(self, group: str, *identifiers: str) -> FakeGroup:
+        if group not in self.custom_groups:
+            raise ValueError(f"Group identifier not initialized: {group}")
+        return FakeGroup(self, ("CUSTOM", group) + tuple(str(i) for i in identifiers), {})
+
+    async def all_guilds(self) -> Dict[int, Dict[str, Any]]:
+        self.stats.hit("config_read")
+        result = {}
+        for guild_key, stored in self._data.get("GUILD", {}).items():
+            merged = copy.deepcopy(self._defaults["GUILD"])
+            merged.update(copy.deepcopy(stored))
+            result[int(guild_key)] = merged
+        return result
+
+    def seed(self, path: Tuple[Any, ...], value: Any) -> None:
+        """통계에 잡히지 않게 초기 데이터를 넣는다."""
+        self._set(tuple(str(p) for p in path), copy.deepcopy(value))
+
+    def _get(self, path: Tuple[str, ...], default: Any) -> Any:
+        node: Any = self._data
+        for key in path:
+            if not isinstance(node, dict) or key not in node:
+                return default
+            node = node[key]
+        return node
+
+    def _set(self, path: Tuple[str, ...], value: Any) -> None:
+        node = self._data
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+
+    def _delete(self, path: Tuple[str, ...]) -> None:
+        node: Any = self._data
+        for key in path[:-1]:
+            if not isinstance(node, dict) or key not in node:
+                return
+            node = node[key]
+        if isinstance(node, dict):
+            node.pop(path[-1], None)
+
+
+# ---------------------------------------------------------------------------
+# discord
+# ---------------------------------------------------------------------------
+
+
+class FakeHTTPResponse:
+    def __init__(self, status: int, reason: str):
+        self.status = status
+        self.reason = reason
+
+
+def not_found() -> discord.NotFound:
+    return discord.NotFound(FakeHTTPResponse(404, "Not Found"), "Unknown Message")
+
+
+class FakeRest:
+    """REST 호출 수를 세고, 필요하면 지연을 흉내 낸다."""
+
+    def __init__(self, stats: IOStats, latency: float = 0.0):
+        self.stats = stats
+        self.latency = latency
+
+    async def call(self, route: str) -> None:
+        self.stats.hit(f"rest:{route}")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakePermissions:
+    def __init__(self, **values: bool):
+        self.manage_roles = values.get("manage_roles", True)
+        self.kick_members = values.get("kick_members", True)
+        self.ban_members = values.get("ban_members", True)
+        self.view_audit_log = values.get("view_audit_log", True)
+
+
+class FakeRole:
+    def __init__(self, guild: "FakeGuild", position: int, role_id: Optional[int] = None):
+        self.id = role_id or snowflake()
+        self.guild = guild
+        self.position = position
+        self.mention = f"<@&{self.id}>"
+
+    def __ge__(self, other: "FakeRole") -> bool:
+        return self.position >= other.position
+
+    def __lt__(self, other: "FakeRole") -> bool:
+        return self.position < other.position
+
+
+class FakeUser:
+    def __init__(self, user_id: Optional[int] = None, *, name: str = "user", bot: bool = False):
+        self.id = user_id or snowflake()
+        self.name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild: "FakeGuild", user_id: Optional[int] = None, *, name: str = "member", bot: bool = False):
+        super().__init__(user_id, name=name, bot=bot)
+        self.guild = guild
+        self.roles: List[FakeRole] = []
+        self.joined_at_perf: Optional[float] = None
+        self.kicked_at_perf: Optional[float] = None
+        self.guild_permissions = FakePermissions()
+        self.top_role = FakeRole(guild, 1)
+
+    async def kick(self, *, reason: Optional[str] = None) -> None:
+        await self.guild.rest.call("kick")
+        self.kicked_at_perf = time.perf_counter()
+        self.guild.members.pop(self.id, None)
+
+    async def add_roles(self, *roles: FakeRole, reason: Optional[str] = None) -> None:
+        await self.guild.rest.call("add_roles")
+        self.roles.extend(roles)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return next((role for role in self.roles if role.id == role_id), None)
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeTextChannel", content: Optional[str], view: Any):
+        self.id = snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.view = view
+
+    @property
+    def components(self) -> List[Any]:
+        """보낸 view를 Discord가 돌려주는 것과 같은 컴포넌트 객체로 바꾼다(``LayoutView.from_message``용)."""
+        if self.view is None:
+            return []
+        components = (_component_factory(data) for data in self.view.to_components())
+        return [component for component in components if component is not None]
+
+    async def edit(self, **fields: Any) -> "FakeMessage":
+        await self.channel.guild.rest.call("edit_message")
+        if self.id not in self.channel.messages:
+            raise not_found()
+        self.content = fields.get("content", self.content)
+        self.view = fields.get("view", self.view)
+        return self
+
+    async def delete(self) -> None:
+        await self.channel.guild.rest.call("delete_message")
+        self.channel.messages.pop(self.id, None)
+
+
+class FakePartialMessage:
+    def __init__(self, channel: "FakeTextChannel", message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **fields: Any) -> FakeMessage:
+        message = self.channel.messages.get(self.id)
+        if message is None:
+            await self.channel.guild.rest.call("edit_message")
+            raise not_found()
+        return await message.edit(**fields)
+
+
+class FakeTextChannel:
+    def __init__(self, guild: "FakeGuild", channel_id: Optional[int] = None, *, name: str = "botgate-log"):
+        self.id = channel_id or snowflake()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.messages: Dict[int, FakeMessage] = {}
+
+    async def send(self, content: Optional[str] = None, **fields: Any) -> FakeMessage:
+        await self.guild.rest.call("send_message")
+        message = FakeMessage(self, content, fields.get("view"))
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.guild.rest.call("fetch_message")
+        message = self.messages.get(message_id)
+        if message is None:
+            raise not_found()
+        return message
+
+    def get_partial_message(self, message_id: int) -> FakePartialMessage:
+        return FakePartialMessage(self, message_id)
+
+
+class FakeGuild:
+    def __init__(self, rest: FakeRest, guild_id: Optional[int] = None, *, name: str = "guild"):
+        self.id = guild_id or snowflake()
+        self.name = name
+        self.unavailable = False
+        self.rest = rest
+        self.owner_id = snowflake()
+        self.members: Dict[int, FakeMember] = {}
+        self.channels: Dict[int, FakeTextChannel] = {}
+        self.roles: Dict[int, FakeRole] = {}
+        self.bans: Dict[int, Any] = {}
+        self.chunked = True
+        self.me = FakeMember(self, name="BotGate", bot=True)
+        self.me.top_role = FakeRole(self, 100)
+        self.members[self.me.id] = self.me
+        self.log_channel = self.add_channel()
+
+    @property
+    def member_count(self) -> int:
+        return len(self.members)
+
+    def add_channel(self) -> FakeTextChannel:
+        channel = FakeTextChannel(self)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_member(self, *, bot: bool = False, user_id: Optional[int] = None) -> FakeMember:
+        member = FakeMember(self, user_id, name=f"{'bot' if bot else 'user'}-{len(self.members)}", bot=bot)
+        self.members[member.id] = member
+        return member
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self.members.get(user_id)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeTextChannel]:
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self.roles.get(role_id)
+
+    async def chunk(self) -> List[FakeMember]:
+        return list(self.members.values())
+
+    async def kick(self, user: Any, *, reason: Optional[str] = None) -> None:
+        await self.rest.call("kick")
+        member = self.members.pop(user.id, None)
+        if member is not None:
+            member.kicked_at_perf = time.perf_counter()
+
+    async def ban(self, user: Any, *, reason: Optional[str] = None, **kwargs: Any) -> None:
+        await self.rest.call("ban")
+        self.bans[user.id] = reason
+        self.members.pop(user.id, None)
+
+    async def unban(self, user: Any, *, reason: Optional[str] = None) -> None:
+        await self.rest.call("unban")
+        self.bans.pop(user.id, None)
+
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+        self.acked_at_perf: Optional[float] = None
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _ack(self, route: str) -> None:
+        if self._done:
+            raise RuntimeError("interaction already responded")
+        await self._interaction.rest.call(route)
+        self._done = True
+        self.acked_at_perf = time.perf_counter()
+
+    async def send_message(self, content: Optional[str] = None, **fields: Any) -> None:
+        await self._ack("interaction_response")
+        self._interaction.sent.append(content)
+
+    async def defer(self, **fields: Any) -> None:
+        await self._ack("interaction_defer")
+
+    async def edit_message(self, **fields: Any) -> None:
+        await self._ack("interaction_response")
+
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, **fields: Any) -> None:
+        await self._interaction.rest.call("interaction_followup")
+        self._interaction.sent.append(content)
+        self._interaction.completed_at_perf = time.perf_counter()
+
+
+class FakeInteraction:
+    def __init__(self, client: "FakeBot", guild: FakeGuild, user: FakeUser, message: Optional[FakeMessage] = None):
+        self.client = client
+        self.guild = guild
+        self.user = user
+        self.message = message
+        self.rest = guild.rest
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        self.sent: List[Optional[str]] = []
+        self.created_at_perf = time.perf_counter()
+        self.completed_at_perf: Optional[float] = None
+
+
+class FakeIntents:
+    def __init__(self, *, members: bool = True, moderation: bool = True):
+        self.members = members
+        self.moderation = moderation
+
+
+class FakeAuditLogEntry:
+    """봇 추가(BOT_ADD) 감사 로그 항목. target은 멤버 캐시에 없을 수 있어 Object처럼 id만 갖는다."""
+
+    def __init__(self, guild: "FakeGuild", target: Any, *, user: Optional[Any] = None):
+        self.action = discord.AuditLogAction.bot_add
+        self.guild = guild
+        self.target = target
+        self.user = user
+
+
+class FakeBot:
+    """Red 봇 대역. cog가 사용하는 메서드만 구현한다."""
+
+    def __init__(self, rest: FakeRest, *, members_intent: bool = True, moderation_intent: bool = True):
+        self.rest = rest
+        self.user = FakeUser(name="BotGate", bot=True)
+        self.intents = FakeIntents(members=members_intent, moderation=moderation_intent)
+        self._guilds: Dict[int, FakeGuild] = {}
+        self._cogs: Dict[str, Any] = {}
+        self.owner_ids: Set[int] = set()
+        self.cached_messages: List[Any] = []
+
+    @property
+    def guilds(self) -> List[FakeGuild]:
+        return list(self._guilds.values())
+
+    def add_guild(self, guild: FakeGuild) -> None:
+        self._guilds[guild.id] = guild
+
+    def get_guild(self, guild_id: int) -> Optional[FakeGuild]:
+        return self._guilds.get(guild_id)
+
+    def get_cog(self, name: str) -> Any:
+        return self._cogs.get(name)
+
+    def register_cog(self, name: str, cog: Any) -> None:
+        self._cogs[name] = cog
+
+    async def is_owner(self, user: Any) -> bool:
+        return user.id in self.owner_ids
+
+    async def is_admin(self, member: Any) -> bool:
+        return False
+
+    async def wait_until_red_ready(self) -> None:
+        return None
+
+    def add_dynamic_items(self, *items: Any) -> None:
+        return None
+
+    def remove_dynamic_items(self, *items: Any) -> None:
+        return None
+
+    def add_view(self, view: Any, *, message_id: Optional[int] = None) -> None:
+        return None
@@ -0,0 +1,232 @@
+"""BotGate 이벤트 기록 재생기
+
+``[p]botgate trace start|stop``으로 남긴 JSONL 기록을 가짜 Discord 객체 위의 cog에 다시 흘려보낸다.
+discord.py와 Red-DiscordBot이 설치된 환경에서 레포 루트 기준으로 실행한다.
+
+    python -m bench.replay trace.jsonl --speed 0 --save before.json
+    python -m bench.replay trace.jsonl --speed 0 --compare before.json
+
+``--speed``는 원래 속도 대비 배율이다(1이면 기록된 간격 그대로, 0이면 최대 속도).
+이벤트 종류별 p50/p99 지연, 이벤트당 Config 읽기/쓰기와 REST 호출 수, 그리고 기록 당시와
+다른 판정(킥/허용)을 보고한다. ``--compare``를 주면 저장해 둔 이전 결과와의 차이를 함께 출력한다.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import botgate.botgate as botgate_module
+from botgate.botgate import ApproveButton, BotGate
+from botgate.storage import ALLOWLIST_GROUP, SCHEMA_KEY
+
+from .bench_botgate import percentile, settle
+from .fakes import FakeAuditLogEntry, FakeBot, FakeConfig, FakeGuild, FakeInteraction, FakeRest, FakeUser, IOStats
+
+MISMATCH_REPORT_LIMIT = 20
+
+
+def load_trace(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as fp:
+        lines = [json.loads(line) for line in fp if line.strip()]
+    if not lines or lines[0].get("k") != "start":
+        raise ValueError(f"{path}: 기록 헤더가 없습니다.")
+    return lines[0], lines[1:]
+
+
+class Replayer:
+    """기록 헤더의 스냅샷으로 가짜 봇/길드/설정을 만들고 이벤트를 순서대로 재생한다."""
+
+    def __init__(self, header: Dict[str, Any]):
+        self.header = header
+        self.stats = IOStats()
+        self.rest = FakeRest(self.stats)
+        self.bot = FakeBot(self.rest)
+        self.guilds: Dict[int, FakeGuild] = {}
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.decisions = {"match": 0, "mismatch": 0}
+        self.mismatches: List[Dict[str, Any]] = []
+        self.skipped: Dict[str, int] = defaultdict(int)
+        self.cog: Optional[BotGate] = None
+
+    async def setup(self) -> None:
+        botgate_module.Config = FakeConfig
+        data_path = Path(tempfile.mkdtemp(prefix="botgate-replay-"))
+        botgate_module.cog_data_path = lambda cog: data_path
+        cog = BotGate(self.bot)
+        self.bot.register_cog("BotGate", cog)
+        config: FakeConfig = cog.config
+        config.stats = self.stats
+        for guild_key, settings in self.header["guilds"].items():
+            guild = self._guild(int(guild_key))
+            for key in ("enabled", "raid_threshold", "raid_window_seconds", "use_global_trust"):
+                config.seed(("GUILD", guild.id, key), settings[key])
+            config.seed(("GUILD", guild.id, "log_channel_id"), guild.log_channel.id)
+            rows: Dict[str, Any] = {str(bot_id): [0, 0] for bot_id in settings["allow"]}
+            rows[SCHEMA_KEY] = 2
+            config.seed(("CUSTOM", ALLOWLIST_GROUP, guild.id), rows)
+        config.seed(
+            ("GLOBAL", "trusted_bots"),
+            {str(bot_id): {"added_by": 0, "added_at": ""} for bot_id in self.header["trusted"]},
+        )
+        await cog.cog_load()
+        self.cog = cog
+        self.stats.reset()
+
+    async def run(self, events: List[Dict[str, Any]], speed: float) -> float:
+        started = time.perf_counter()
+        for event in events:
+            if speed > 0:
+                delay = started + event["t"] / speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            handler = getattr(self, f"_on_{event['k']}", None)
+            if handler is None:
+                self.skipped[event["k"]] += 1
+                continue
+            t0 = time.perf_counter()
+            await handler(event)
+            self.latencies[event["k"]].append(time.perf_counter() - t0)
+        # 킥 대기열과 로그 전송이 끝날 때까지 기다려야 REST 호출 수가 맞는다.
+        await settle(self.cog)
+        return time.perf_counter() - started
+
+    async def teardown(self) -> None:
+        if self.cog is not None:
+            await self.cog.cog_unload()
+
+    async def _on_join(self, event: Dict[str, Any]) -> None:
+        guild = self._guild(event["g"])
+        member = guild.add_member(bot=True, user_id=event["b"])
+        counters = self.cog._metrics.counters
+        allowed, unapproved = counters["joins_allowed"], counters["joins_unapproved"]
+        if event.get("via") == "audit_log":
+            # 기록 당시 감사 로그 BOT_ADD가 먼저 와서 처리된 입장
+            await self.cog.on_audit_log_entry_create(FakeAuditLogEntry(guild, member))
+        else:
+            await self.cog.on_member_join(member)
+        if counters["joins_allowed"] > allowed:
+            decision = "allow"
+        elif counters["joins_unapproved"] > unapproved:
+            decision = "kick"
+        else:
+            decision = "off"
+        if decision == event["d"]:
+            self.decisions["match"] += 1
+            return
+        self.decisions["mismatch"] += 1
+        if len(self.mismatches) < MISMATCH_REPORT_LIMIT:
+            self.mismatches.append({"t": event["t"], "g": event["g"], "b": event["b"], "was": event["d"], "now": decision})
+
+    async def _on_approve(self, event: Dict[str, Any]) -> None:
+        guild = self._guild(event["g"])
+        # 기록에는 권한 검사를 통과한 승인만 남으므로 승인자를 봇 소유자로 취급한다.
+        self.bot.owner_ids.add(event["u"])
+        if event["src"] == "button":
+            interaction = FakeInteraction(self.bot, guild, FakeUser(event["u"]))
+            await ApproveButton(guild.id, event["b"]).callback(interaction)
+            # 기록과 같은 결과를 보려면 백그라운드 승인이 끝난 뒤 다음 이벤트로 넘어가야 한다.
+            task = self.cog._approval_tasks.get((guild.id, event["b"]))
+            if task is not None:
+                await task
+        else:
+            await self.cog._approve_bot(guild, event["b"], approved_by=event["u"], source=event["src"])
+
+    async def _on_approve_bulk(self, event: Dict[str, Any]) -> None:
+        guild = self._guild(event["g"])
+        await self.cog._approve_bots(
+            guild, {bot_id: None for bot_id in event["bs"]}, approved_by=event["u"], source=event["src"]
+        )
+
+    def _guild(self, guild_id: int) -> FakeGuild:
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            guild = FakeGuild(self.rest, guild_id, name=f"guild-{len(self.guilds)}")
+            self.bot.add_guild(guild)
+            self.guilds[guild_id] = guild
+        return guild
+
+    def summary(self, events: int, elapsed: float) -> Dict[str, Any]:
+        per_event = max(1, events)
+        return {
+            "events": events,
+            "elapsed": elapsed,
+            "latency": {
+                kind: {
+                    "p50": percentile(samples, 50),
+                    "p99": percentile(samples, 99),
+                    "n": len(samples),
+                }
+                for kind, samples in sorted(self.latencies.items())
+            },
+            "config_reads": self.stats.counts["config_read"] / per_event,
+            "config_writes": self.stats.counts["config_write"] / per_event,
+            "rest_calls": self.stats.rest_total() / per_event,
+            "decisions": dict(self.decisions),
+            "mismatches": self.mismatches,
+            "skipped": dict(self.skipped),
+        }
+
+
+def report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    def delta(value: float, old: Optional[float], scale: float = 1.0, unit: str = "") -> str:
+        if old is None:
+            return ""
+        return f" ({(value - old) * scale:+.3f}{unit})"
+
+    print(f"events={result['events']} elapsed={result['elapsed']:.2f}s")
+    for kind, latency in result["latency"].items():
+        old = (baseline or {}).get("latency", {}).get(kind, {})
+        print(
+            f"  {kind:<13} p50={latency['p50'] * 1e6:9.1f}us{delta(latency['p50'], old.get('p50'), 1e6, 'us')} "
+            f"p99={latency['p99'] * 1e6:9.1f}us{delta(latency['p99'], old.get('p99'), 1e6, 'us')} "
+            f"(n={latency['n']})"
+        )
+    for key, label in (("config_reads", "config reads"), ("config_writes", "config writes"), ("rest_calls", "rest calls")):
+        old = baseline.get(key) if baseline else None
+        print(f"  {label:<14}/event={result[key]:.3f}{delta(result[key], old)}")
+    decisions = result["decisions"]
+    print(f"  decisions     match={decisions['match']} mismatch={decisions['mismatch']}")
+    for mismatch in result["mismatches"]:
+        print(f"    t={mismatch['t']:.3f}s guild={mismatch['g']} bot={mismatch['b']} {mismatch['was']} -> {mismatch['now']}")
+    if result["skipped"]:
+        skipped = " ".join(f"{kind}={count}" for kind, count in sorted(result["skipped"].items()))
+        print(f"  skipped       {skipped}")
+
+
+async def replay(path: str, speed: float) -> Dict[str, Any]:
+    header, events = load_trace(path)
+    replayer = Replayer(header)
+    await replayer.setup()
+    try:
+        elapsed = await replayer.run(events, speed)
+    finally:
+        await replayer.teardown()
+    return replayer.summary(len(events), elapsed)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace")
+    parser.add_argument("--speed", type=float, default=0.0, help="기록 대비 재생 배율(0이면 최대 속도)")
+    parser.add_argument("--save", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(replay(args.trace, args.speed))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+    report(result, baseline)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fp:
+            json.dump(result, fp, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,191 @@
-from typing import List, Optional
+import asyncio
+import copy
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 import discord
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
+
+from .browse import LIST_PAGE_SIZE, AllowlistIndex, ListQuery, parse_list_query
+from .fanout import FanOutResult, fan_out
+from .log import ConsoleLog
+from .logdispatch import LogDispatcher
+from .metrics import Metrics
+from .raid import KickQueue, RaidState, RejoinTracker
+from .retry import RetryExecutor
+from .shared import SHARED_DB_NAME, SHARED_POLL_INTERVAL, SHARED_PRUNE_INTERVAL, SharedState
+from .storage import (
+    ALLOWLIST_GROUP,
+    JOURNAL_NAME,
+    WRITE_BEHIND_INTERVAL,
+    AllowlistStore,
+    AllowRecord,
+    BanStore,
+    PendingStore,
+    WriteBehindJournal,
+)
+from .trace import TRACE_DIR, TraceRecorder
 
 LOG_COOLDOWN_SECONDS = 30
+RAID_PAGE_SIZE = 20
+MAX_LAYOUT_COMPONENTS = 40
+MAX_LAYOUT_TEXT = 4000
+KICK_REASON = "BotGate: 미승인 봇 자동 킥"
+BAN_REASON = "BotGate: 미승인 봇 반복 재입장으로 임시 차단"
+UNBAN_REASON = "BotGate: 임시 차단 만료"
+UNBAN_CHECK_INTERVAL = 300
+APPROVAL_DRAIN_TIMEOUT = 5
+KICK_DRAIN_TIMEOUT = 10
+# 방금 수정한 알림 메시지를 보관하는 개수. 레이드 요약처럼 한 메시지에 버튼이 여럿이면
+# 연달아 승인할 때 게이트웨이 MESSAGE_UPDATE를 기다리지 않고 최신 내용에서 이어서 고친다.
+EDITED_ALERT_CACHE_SIZE = 128
+# member join과 audit log BOT_ADD 중 먼저 온 신호만 처리한다. 이 시간 안에 온 다른 경로의 신호는 같은 입장으로 본다.
+JOIN_SIGNAL_TTL = 60
+JOIN_SIGNAL_PATHS = ("member_join", "audit_log")
+PENDING_MAX_PER_GUILD = 500
+PENDING_SWEEP_INTERVAL = 15 * 60
+PENDING_CHECK_BATCH = 10
+PENDING_CHECK_PAUSE = 1.0
+METRICS_EXPORT_INTERVAL = 15
+BOT_ID_PATTERN = re.compile(r"\b\d{15,21}\b")
+SWEEP_CHUNK_SIZE = 1000
+SWEEP_ACTION_INTERVAL = 0.5
+SWEEP_PROGRESS_INTERVAL = 5.0
+BULK_LOG_PREVIEW = 30
+
+GUILD_DEFAULTS: Dict[str, Any] = {
+    "enabled": False,
+    "log_channel_id": None,
+    "approved_role_id": None,
+    # 예전 버전의 dict 허용 목록. cog_load에서 AllowlistStore로 옮긴 뒤 비운다.
+    "allowlist": {},
+    "approver_user_ids": [],
+    "approver_role_ids": [],
+    "approver_owner_always": True,
+    # 예전 버전의 승인 대기 목록. cog_load에서 PendingStore로 옮긴 뒤 비운다.
+    "pending_approvals": [],
+    "pending_ttl_hours": 72,
+    # raid_window_seconds 안에 미승인 봇이 raid_threshold개 이상(마지막 봇 포함) 들어오면 레이드(0이면 OFF)
+    "raid_threshold": 10,
+    "raid_window_seconds": 10,
+    "use_global_trust": True,
+    # rejoin_window_seconds 안에 같은 미승인 봇이 이만큼 들어오면 킥 대신 rejoin_ban_hours 동안 차단(0이면 OFF)
+    "rejoin_ban_threshold": 0,
+    "rejoin_window_seconds": 600,
+    "rejoin_ban_hours": 24,
+}
+
 
+class ApproveButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"botgate_approve:(?P<guild_id>[0-9]+):(?P<bot_id>[0-9]+)",
+):
+    """모든 승인 버튼을 처리하는 단일 템플릿. 메시지별 view 등록 없이 custom_id로 대상을 찾는다."""
 
-class ApproveButton(discord.ui.Button):
-    def __init__(self, cog: "BotGate", guild_id: int, bot_id: int):
-        custom_id = f"botgate_approve:{guild_id}:{bot_id}"
+    def __init__(self, guild_id: int, bot_id: int, *, label: Optional[str] = None):
         super().__init__(
-            label="허용(서버 소유자만)",
-            style=discord.ButtonStyle.success,
-            custom_id=custom_id,
+            discord.ui.Button(
+                label=label or "허용(서버 소유자만)",
+                style=discord.ButtonStyle.success,
+                custom_id=f"botgate_approve:{guild_id}:{bot_id}",
+            )
         )
-        self.cog = cog
         self.guild_id = guild_id
         self.bot_id = bot_id
 
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: "re.Match[str]",
+    ) -> "ApproveButton":
+        return cls(int(match["guild_id"]), int(match["bot_id"]), label=item.label)
+
     async def callback(self, interaction: discord.Interaction):
+        clicked = time.perf_counter()
+        cog = interaction.client.get_cog("BotGate")
+        if cog is None:
+            await interaction.response.send_message("BotGate가 로드되어 있지 않습니다.", ephemeral=True)
+            return
         if not interaction.guild or interaction.guild.id != self.guild_id:
             await interaction.response.send_message("서버 정보가 일치하지 않습니다.", ephemeral=True)
             return
-        if not await self.cog._user_can_approve(interaction.user, interaction.guild):
-            await interaction.response.send_message("승인 권한이 없습니다.", ephemeral=True)
-            return
 
-        await self.cog._approve_bot(
-            interaction.guild,
-            self.bot_id,
-            approved_by=interaction.user.id,
-            source="button",
+        # 권한 확인(Config 읽기)과 승인(쓰기/로그/역할)은 3초 응답 기한을 넘길 수 있으므로 먼저 응답한다.
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        cog._metrics.observe("approve.click_to_ack", time.perf_counter() - clicked)
+        if not cog._start_button_approval(interaction, self.bot_id, clicked):
+            await interaction.followup.send("이미 승인 처리 중입니다.", ephemeral=True)
+
+
+class AllowlistPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=(
+        r"botgate_list:(?P<guild_id>[0-9]+):(?P<sort>[a-z]+):"
+        r"(?P<approver_id>[0-9]+):(?P<since>[0-9]+):(?P<page>[0-9]+)"
+    ),
+):
+    """허용 목록 페이지 버튼. 조회 조건과 페이지를 custom_id에 담아 페이지별 view를 보관하지 않는다."""
+
+    def __init__(
+        self,
+        guild_id: int,
+        query: ListQuery,
+        page: int,
+        *,
+        label: str,
+        disabled: bool = False,
+    ):
+        super().__init__(
+            discord.ui.Button(
+                label=label,
+                style=discord.ButtonStyle.secondary,
+                disabled=disabled,
+                custom_id=(
+                    f"botgate_list:{guild_id}:{query.sort}:{query.approver_id}:{query.since}:{page}"
+                ),
+            )
         )
-        await interaction.response.send_message("승인 완료. 허용 목록에 추가했습니다.", ephemeral=True)
+        self.guild_id = guild_id
+        self.query = query
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(
+        cls,
+        interaction: discord.Interaction,
+        item: discord.ui.Button,
+        match: "re.Match[str]",
+    ) -> "AllowlistPageButton":
+        query = ListQuery(match["sort"], int(match["approver_id"]), int(match["since"]))
+        return cls(int(match["guild_id"]), query, int(match["page"]), label=item.label or "")
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("BotGate")
+        if cog is None:
+            await interaction.response.send_message("BotGate가 로드되어 있지 않습니다.", ephemeral=True)
+            return
+        if not interaction.guild or interaction.guild.id != self.guild_id:
+            await interaction.response.send_message("서버 정보가 일치하지 않습니다.", ephemeral=True)
+            return
+        if not await cog._user_can_browse(interaction.user, interaction.guild):
+            await interaction.response.send_message("허용 목록을 볼 권한이 없습니다.", ephemeral=True)
+            return
+        view = cog._allowlist_page_view(interaction.guild, self.query, self.page)
+        await interaction.response.edit_message(view=view)
+        view.stop()
 
 
 class InviteLinkButton(discord.ui.Button):
@@ -104,6 +256,7 @@ class BotGateLayoutView(discord.ui.LayoutView):
         use_container: bool = False,
     ):
         super().__init__(timeout=None)
+        self.pending_bot_ids: List[int] = []
         container = _add_layout_text(
             self,
             title,
@@ -112,9 +265,9 @@ class BotGateLayoutView(discord.ui.LayoutView):
             accent_color=accent_color,
             use_container=use_container,
         )
-        if actions:
+        for start in range(0, len(actions or ()), 5):
             row = discord.ui.ActionRow()
-            for item in actions:
+            for item in actions[start:start + 5]:
                 row.add_item(item)
             if container is not None:
                 container.add_item(row)
@@ -122,6 +275,165 @@ class BotGateLayoutView(discord.ui.LayoutView):
                 self.add_item(row)
 
 
+class LayoutTemplate:
+    """제목/꼬리말/색상이 고정된 BotGateLayoutView 틀
+
+    ``static()``은 본문까지 고정된 view를 처음 한 번만 만들고 같은 인스턴스를 돌려준다.
+    상호작용 아이템이 없는 view는 보내도 상태가 바뀌지 않아 재사용할 수 있다.
+    단, _send_log는 병합하면서 아이템을 옮기므로 static view는 명령 응답/채널 전송에만 쓴다.
+    ``render()``는 고정된 제목/꼬리말/색상을 반복해 적지 않도록 하는 편의 함수일 뿐이며,
+    매번 BotGateLayoutView를 새로 만들므로 생성 비용은 직접 만드는 것과 같다.
+    """
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        *,
+        lines: Optional[List[str]] = None,
+        footer: Optional[str] = None,
+        accent_color: Optional[int] = None,
+    ):
+        self.title = title
+        self.lines = list(lines) if lines else None
+        self.footer = footer
+        self.accent_color = accent_color
+        self._static: Optional[BotGateLayoutView] = None
+
+    def static(self) -> BotGateLayoutView:
+        if self._static is None:
+            self._static = self.render(self.lines)
+        return self._static
+
+    def render(
+        self,
+        lines: Optional[List[str]] = None,
+        *,
+        actions: Optional[List[discord.ui.Item]] = None,
+    ) -> BotGateLayoutView:
+        return BotGateLayoutView(
+            title=self.title,
+            lines=lines,
+            footer=self.footer,
+            actions=actions,
+            accent_color=self.accent_color,
+            use_container=True,
+        )
+
+
+HELP = LayoutTemplate(
+    "BotGate 명령어",
+    lines=[
+        "`!botgate toggle` - 기능 ON/OFF",
+        "`!botgate channel <채널>` - 로그 채널 설정",
+        "`!botgate setrole <역할|none>` - 승인 봇 자동 역할",
+        "`!botgate status` - 현재 설정 요약",
+        "`!botgate allow <bot_id...>` - 봇 수동 허용(파일 첨부로 일괄 허용)",
+        "`!botgate deny <bot_id...>` - 봇 수동 차단",
+        "`!botgate list [newest|oldest|id] [@승인자] [YYYY-MM-DD]` - 허용 목록 보기",
+        "`!botgate export` - 허용 목록 JSON 내보내기",
+        "`!botgate raid <threshold> [window]` - window초 안에 미승인 봇 threshold개 이상이면 레이드(0이면 OFF)",
+        "`!botgate rejoin <threshold> [window] [hours]` - 반복 재입장 봇 임시 차단",
+        "`!botgate pendingttl <hours>` - 승인 대기 알림 보관 시간",
+        "`!botgate stats` - 처리 단계별 지연/카운터",
+        "`!botgate sweep [apply]` - 기존 봇을 허용 목록과 대조(apply를 줘야 킥/역할 부여)",
+        "`!botgate globaltrust <true|false>` - 전역 신뢰 목록 사용 여부",
+        "`!botgate approver ...` - 승인 권한자 관리",
+    ],
+    accent_color=int(discord.Color.blurple()),
+)
+
+APPROVER_HELP = LayoutTemplate(
+    "BotGate 승인 권한자 명령어",
+    lines=[
+        "`!botgate approver adduser @user` - 승인 권한 유저 추가",
+        "`!botgate approver deluser @user` - 승인 권한 유저 삭제",
+        "`!botgate approver addrole @role` - 승인 권한 역할 추가",
+        "`!botgate approver delrole @role` - 승인 권한 역할 삭제",
+        "`!botgate approver list` - 승인 권한자 목록",
+        "`!botgate approver reset` - 승인 권한자 초기화",
+        "`!botgate approver owneralways true|false` - 소유자 항상 허용",
+    ],
+    accent_color=int(discord.Color.blurple()),
+)
+
+ROLE_CLEARED = LayoutTemplate(
+    "자동 역할 해제",
+    lines=["자동 역할 부여를 해제했습니다."],
+    accent_color=int(discord.Color.orange()),
+)
+
+ROLE_NOT_FOUND = LayoutTemplate(
+    "역할 찾기 실패",
+    lines=["역할을 찾을 수 없습니다. 멘션 또는 역할 이름을 사용하세요."],
+    accent_color=int(discord.Color.red()),
+)
+
+NOT_IN_ALLOWLIST = LayoutTemplate(
+    "허용 목록 없음",
+    lines=["해당 봇은 허용 목록에 없습니다."],
+    accent_color=int(discord.Color.red()),
+)
+
+INVALID_RAID_VALUES = LayoutTemplate(
+    "잘못된 값",
+    lines=["threshold는 0 이상, window는 1초 이상이어야 합니다."],
+    accent_color=int(discord.Color.red()),
+)
+
+INVALID_REJOIN_VALUES = LayoutTemplate(
+    "잘못된 값",
+    lines=["threshold는 0 이상, window는 1초 이상, hours는 1시간 이상이어야 합니다."],
+    accent_color=int(discord.Color.red()),
+)
+
+INVALID_PENDING_TTL = LayoutTemplate(
+    "잘못된 값",
+    lines=["보관 시간은 1시간 이상이어야 합니다."],
+    accent_color=int(discord.Color.red()),
+)
+
+SWEEP_IN_PROGRESS = LayoutTemplate(
+    "점검 진행 중",
+    lines=["이 서버에서 이미 점검이 진행 중입니다."],
+    accent_color=int(discord.Color.orange()),
+)
+
+OWNER_ONLY = LayoutTemplate(
+    "권한 부족",
+    lines=["이 명령어는 서버 소유자만 사용할 수 있습니다."],
+    accent_color=int(discord.Color.red()),
+)
+
+APPROVERS_RESET = LayoutTemplate(
+    "초기화 완료",
+    lines=["승인 권한자를 모두 초기화했습니다. (소유자 항상 허용: ON)"],
+    accent_color=int(discord.Color.green()),
+)
+
+INTENT_WARNING = LayoutTemplate(
+    "⚠️ BotGate 경고",
+    lines=[
+        "members intent가 꺼져 있어 봇 입장 감지가 감사 로그(BOT_ADD)에만 의존합니다.",
+        "moderation intent나 `View Audit Log` 권한이 없으면 미승인 봇을 감지하지 못합니다.",
+    ],
+    accent_color=int(discord.Color.orange()),
+)
+
+TRUST_HELP = LayoutTemplate(
+    "BotGate 전역 신뢰 목록 명령어",
+    lines=[
+        "`!botgate trust add <bot_id...>` - 전역 신뢰 봇 추가(첨부 파일로 대량 추가 가능)",
+        "`!botgate trust remove <bot_id...>` - 전역 신뢰 봇 제거",
+        "`!botgate trust list` - 전역 신뢰 목록",
+    ],
+    accent_color=int(discord.Color.blurple()),
+)
+
+ANNOUNCEMENT = LayoutTemplate("📢 BotGate 공지", accent_color=int(discord.Color.blurple()))
+
+APPROVED_JOIN = LayoutTemplate("✅ 승인된 봇 입장 확인", accent_color=int(discord.Color.green()))
+
+
 class ApproveLayoutView(BotGateLayoutView):
     def __init__(
         self,
@@ -137,9 +449,8 @@ class ApproveLayoutView(BotGateLayoutView):
         self.cog = cog
         self.guild_id = guild_id
         self.bot_id = bot_id
-        self.tracks_approval = True
         actions = [
-            ApproveButton(cog, guild_id, bot_id),
+            ApproveButton(guild_id, bot_id),
             InviteLinkButton(bot_id, cog._oauth_url(bot_id)),
         ]
         super().__init__(
@@ -150,9 +461,193 @@ class ApproveLayoutView(BotGateLayoutView):
             accent_color=accent_color,
             use_container=True,
         )
+        self.pending_bot_ids = [bot_id]
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item) -> None:
+        await self.cog._log_console(
+            f"view error: {error}", level=logging.ERROR, guild_id=self.guild_id, stage="view"
+        )
+
+
+class RaidSummaryLayoutView(BotGateLayoutView):
+    def __init__(
+        self,
+        cog: "BotGate",
+        guild_id: int,
+        kicked: List[Tuple[int, str, Optional[str]]],
+        *,
+        title: str,
+        lines: List[str],
+        footer: Optional[str] = None,
+    ):
+        self.cog = cog
+        self.guild_id = guild_id
+        actions = [
+            ApproveButton(guild_id, bot_id, label=f"허용 {name[:60]}")
+            for bot_id, name, _ in kicked
+        ]
+        super().__init__(
+            title=title,
+            lines=lines,
+            footer=footer,
+            actions=actions,
+            accent_color=int(discord.Color.red()),
+            use_container=True,
+        )
+        self.pending_bot_ids = [bot_id for bot_id, _, _ in kicked]
 
     async def on_error(self, interaction: discord.Interaction, error: Exception, item) -> None:
-        await self.cog._log_console(f"[BotGate] View error: {error}")
+        await self.cog._log_console(
+            f"view error: {error}", level=logging.ERROR, guild_id=self.guild_id, stage="view"
+        )
+
+
+def _layout_size(view: discord.ui.LayoutView) -> Tuple[int, int]:
+    components = 0
+    text = 0
+    for item in view.walk_children():
+        components += 1
+        if isinstance(item, discord.ui.TextDisplay):
+            text += len(item.content)
+    return components, text
+
+
+def _merge_layout_views(views: List[discord.ui.LayoutView]) -> List[BotGateLayoutView]:
+    """여러 로그 view의 최상위 아이템을 컴포넌트/텍스트 한도 안에서 한 메시지로 합친다."""
+    if len(views) == 1:
+        return [views[0]]
+    merged: List[BotGateLayoutView] = []
+    current: Optional[BotGateLayoutView] = None
+    components = text = 0
+    for view in views:
+        size, length = _layout_size(view)
+        if (
+            current is None
+            or components + size > MAX_LAYOUT_COMPONENTS
+            or text + length > MAX_LAYOUT_TEXT
+        ):
+            current = BotGateLayoutView()
+            merged.append(current)
+            components = text = 0
+        for item in list(view.children):
+            view.remove_item(item)
+            current.add_item(item)
+        current.pending_bot_ids.extend(getattr(view, "pending_bot_ids", ()))
+        components += size
+        text += length
+    return merged
+
+
+def _mark_alert_approved(view: discord.ui.LayoutView, bot_ids: Iterable[int], guild_id: int, line: str) -> Set[int]:
+    """알림 view에서 ``bot_ids``의 승인 버튼을 빼고 버튼이 있던 컨테이너에 ``line``을 붙인다.
+
+    남은 승인 버튼이 없는 컨테이너는 초록색으로 바꾼다. 실제로 버튼을 뺀 봇 ID를 돌려준다.
+    """
+    custom_ids = {f"botgate_approve:{guild_id}:{bot_id}": bot_id for bot_id in bot_ids}
+    marked: Set[int] = set()
+    parents = [view, *(item for item in view.children if isinstance(item, discord.ui.Container))]
+    for parent in parents:
+        rows = [item for item in parent.children if isinstance(item, discord.ui.ActionRow)]
+        touched = False
+        for row in rows:
+            for button in list(row.children):
+                bot_id = custom_ids.get(getattr(button, "custom_id", None))
+                if bot_id is None:
+                    continue
+                row.remove_item(button)
+                marked.add(bot_id)
+                touched = True
+            if not row.children:
+                parent.remove_item(row)
+        if not touched:
+            continue
+        parent.add_item(discord.ui.TextDisplay(line))
+        remaining = any(
+            str(getattr(button, "custom_id", None) or "").startswith("botgate_approve:")
+            for item in parent.children
+            if isinstance(item, discord.ui.ActionRow)
+            for button in item.children
+        )
+        if isinstance(parent, discord.ui.Container) and not remaining:
+            parent.accent_colour = discord.Colour.green()
+    return marked
+
+
+class _AuditLogBot(discord.Object):
+    """audit log BOT_ADD만 받고 멤버 캐시에는 아직 없는 봇. 킥/차단 경로에서 Member 대신 쓴다."""
+
+    bot = True
+
+    def __init__(self, guild: discord.Guild, bot_id: int):
+        super().__init__(id=bot_id)
+        self.guild = guild
+
+    def __str__(self) -> str:
+        return f"<@{self.id}>"
+
+    async def kick(self, *, reason: Optional[str] = None) -> None:
+        await self.guild.kick(self, reason=reason)
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        fp.write(text)
+    os.replace(tmp_path, path)
+
+
+def _parse_bot_ids(text: str) -> List[int]:
+    """공백/쉼표/줄바꿈/JSON 배열 등 구분과 상관없이 snowflake 형태의 숫자만 순서대로 뽑는다."""
+    seen: Set[int] = set()
+    result = []
+    for match in BOT_ID_PATTERN.finditer(text):
+        bot_id = int(match.group())
+        if bot_id not in seen:
+            seen.add(bot_id)
+            result.append(bot_id)
+    return result
+
+
+def _parse_allowlist_import(text: str) -> Dict[int, Optional[AllowRecord]]:
+    """allow 명령에 넘어온 텍스트/첨부 파일에서 봇 ID와(있으면) 승인 메타데이터를 뽑는다.
+
+    export 명령의 JSON, ``bot_id`` 열이 있는 CSV는 승인자/시각을 그대로 살리고,
+    그 밖의 형식은 ID만 뽑는다(record는 None).
+    """
+    stripped = text.strip()
+    try:
+        data = json.loads(stripped)
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and isinstance(data.get("entries"), list):
+        rows = data["entries"]
+    elif isinstance(data, list) and all(isinstance(row, dict) for row in data):
+        rows = data
+    elif stripped.lower().startswith("bot_id"):
+        rows = list(csv.DictReader(io.StringIO(stripped)))
+    else:
+        return {bot_id: None for bot_id in _parse_bot_ids(text)}
+
+    result: Dict[int, Optional[AllowRecord]] = {}
+    for row in rows:
+        try:
+            bot_id = int(row["bot_id"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        try:
+            record = AllowRecord.decode(row)
+        except (KeyError, TypeError, ValueError):
+            record = None
+        result.setdefault(bot_id, record)
+    return result
+
+
+async def _read_attachments(ctx: commands.Context) -> str:
+    chunks = []
+    for attachment in ctx.message.attachments:
+        data = await attachment.read()
+        chunks.append(data.decode("utf-8", errors="replace"))
+    return "\n".join(chunks)
 
 
 class BotGate(commands.Cog):
@@ -161,80 +656,313 @@ class BotGate(commands.Cog):
     def __init__(self, bot: Red):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=9045229001, force_registration=True)
-        self.config.register_guild(
-            enabled=False,
-            log_channel_id=None,
-            approved_role_id=None,
-            allowlist={},
-            approver_user_ids=[],
-            approver_role_ids=[],
-            approver_owner_always=True,
-            pending_approvals=[],
-        )
+        self.config.register_guild(**GUILD_DEFAULTS)
+        self.config.register_global(metrics_path=None, trusted_bots={}, shared_state=False)
+        self._allowlist = AllowlistStore(self.config)
+        self._pending = PendingStore(self.config)
         self._log_cooldown = {}
         self._intents_warned = False
+        # guild_id -> 설정 스냅샷. 모든 쓰기는 _set_setting을 거쳐 Config와 함께 갱신된다.
+        self._settings: Dict[int, Dict[str, Any]] = {}
+        self._kick_queues: Dict[int, KickQueue] = {}
+        self._raids: Dict[int, RaidState] = {}
+        self._rejoins: Dict[int, RejoinTracker] = {}
+        # 다음 킥을 임시 차단으로 올릴 (guild_id, bot_id)
+        self._escalate: Set[Tuple[int, int]] = set()
+        self._bans = BanStore(self.config)
+        self._unbanner: Optional[asyncio.Task] = None
+        self._unban_wakeup: Optional[asyncio.Event] = None
+        # 버튼 승인은 응답 후 백그라운드로 처리한다. (guild_id, bot_id) -> 진행 중인 작업
+        self._approval_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._alert_locks: Dict[int, asyncio.Lock] = {}
+        # (guild_id, bot_id) -> (먼저 온 신호 경로, monotonic 시각)
+        self._join_signals: "OrderedDict[Tuple[int, int], Tuple[str, float]]" = OrderedDict()
+        self._edited_alerts: "OrderedDict[int, discord.Message]" = OrderedDict()
+        self._log_dispatcher = LogDispatcher(self._flush_logs)
+        self._startup_task: Optional[asyncio.Task] = None
+        self._pending_sweeper: Optional[asyncio.Task] = None
+        self._metrics = Metrics()
+        self._console = ConsoleLog()
+        self._sweeps: Set[int] = set()
+        # bot_id -> {"added_by", "added_at"}. 모든 길드에서 허용되는 봇(길드별로 끌 수 있음)
+        self._trusted_bots: Dict[int, Dict[str, Any]] = {}
+        self._metrics_path: Optional[str] = None
+        self._metrics_exporter: Optional[asyncio.Task] = None
+        # 여러 샤드 프로세스가 쿨다운/무효화 이벤트를 나눠 쓰는 SQLite 저장소(선택)
+        self._shared: Optional[SharedState] = None
+        self._shared_poller: Optional[asyncio.Task] = None
+        # 허용 목록/승인 대기 행 쓰기를 모아서 반영한다. 경로는 cog_load에서 연다.
+        self._journal = WriteBehindJournal(on_flush=self._on_journal_flush)
+        self._journal.attach(self._allowlist)
+        self._journal.attach(self._pending)
+        self._journal.attach(self._bans)
+        self._journal_flusher: Optional[asyncio.Task] = None
+        self._allowlist_index = AllowlistIndex(self._allowlist)
+        # 켜져 있으면 join/승인/명령 이벤트를 재생용 익명 JSONL로 남긴다.
+        self._trace: Optional[TraceRecorder] = None
+        # 킥/역할 부여 REST 호출의 재시도와 길드별 동시 요청 상한
+        self._moderation = RetryExecutor(on_retry=self._on_moderation_retry)
 
     async def cog_load(self):
+        started = time.perf_counter()
+        self._console.start()
+        self.bot.add_dynamic_items(ApproveButton, AllowlistPageButton)
+        all_guilds, global_settings, _, _, _ = await asyncio.gather(
+            self.config.all_guilds(),
+            self.config.all(),
+            self._allowlist.load(),
+            self._pending.load(),
+            self._bans.load(),
+        )
+        self._settings = dict(all_guilds)
+        self._metrics_path = global_settings["metrics_path"]
+        self._trusted_bots = {
+            int(bot_id): record for bot_id, record in global_settings["trusted_bots"].items()
+        }
+        replayed = await self._journal.open(str(cog_data_path(self) / JOURNAL_NAME))
+        if replayed:
+            await self._log_console(f"replayed {replayed} journaled writes", stage="startup")
+        self._journal_flusher = asyncio.create_task(self._journal_flush_loop())
+        await asyncio.gather(self._migrate_legacy_allowlists(), self._restore_pending_views())
+        if global_settings["shared_state"]:
+            await self._start_shared_state()
+        # 인텐트 경고처럼 급하지 않은 작업은 봇 준비 후 백그라운드에서 처리한다.
+        self._startup_task = asyncio.create_task(self._deferred_startup())
+        self._pending_sweeper = asyncio.create_task(self._pending_sweep_loop())
+        self._metrics_exporter = asyncio.create_task(self._metrics_export_loop())
+        self._unban_wakeup = asyncio.Event()
+        self._unbanner = asyncio.create_task(self._unban_loop())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        await self._log_console(
+            f"loaded {len(self._settings)} guild snapshots in {elapsed_ms:.1f}ms", stage="startup"
+        )
+
+    async def _deferred_startup(self):
+        await self.bot.wait_until_red_ready()
         await self._maybe_warn_intents()
-        await self._restore_pending_views()
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(ApproveButton, AllowlistPageButton)
+        for task in (self._startup_task, self._pending_sweeper, self._metrics_exporter, self._unbanner):
+            if task is not None:
+                task.cancel()
+        # 대기열에 남은 킥과 모아 둔 레이드 요약은 로그 디스패처가 닫히기 전에 마무리한다.
+        await asyncio.gather(*(queue.drain(KICK_DRAIN_TIMEOUT) for queue in self._kick_queues.values()))
+        for guild_id, raid in self._raids.items():
+            if raid.summary_task is not None:
+                raid.summary_task.cancel()
+            kicked, raid.kicked = raid.kicked, []
+            guild = self.bot.get_guild(guild_id)
+            if kicked and guild is not None:
+                await self._post_raid_summary(guild, kicked)
+        if self._approval_tasks:
+            # 진행 중인 승인이 저널에 기록될 때까지 잠시 기다린다.
+            _, unfinished = await asyncio.wait(list(self._approval_tasks.values()), timeout=APPROVAL_DRAIN_TIMEOUT)
+            for task in unfinished:
+                task.cancel()
+        await self._log_dispatcher.close()
+        if self._journal_flusher is not None:
+            self._journal_flusher.cancel()
+        await self._journal.close()
+        await self._stop_shared_state()
+        if self._trace is not None:
+            await self._trace.close()
+        self._console.stop()
+
+    def _guild_settings(self, guild_id: int) -> Dict[str, Any]:
+        settings = self._settings.get(guild_id)
+        if settings is None:
+            settings = copy.deepcopy(GUILD_DEFAULTS)
+            self._settings[guild_id] = settings
+        return settings
+
+    async def _set_setting(self, guild_id: int, key: str, value: Any) -> None:
+        await self.config.guild_from_id(guild_id).get_attr(key).set(value)
+        self._guild_settings(guild_id)[key] = value
+        await self._publish_change("settings", guild_id)
+
+    async def _journal_flush_loop(self):
+        while True:
+            await asyncio.sleep(WRITE_BEHIND_INTERVAL)
+            if not self._journal.pending:
+                continue
+            try:
+                with self._metrics.timer("journal.flush"):
+                    await self._journal.flush()
+            except Exception as exc:
+                await self._log_console(
+                    f"journal flush failed: {exc}", level=logging.ERROR, stage="journal"
+                )
+
+    async def _on_journal_flush(self, group: str, guild_id: int):
+        # 다른 프로세스는 Config에 반영된 뒤에 다시 읽어야 하므로 여기서 알린다.
+        if group == ALLOWLIST_GROUP:
+            await self._publish_change("allowlist", guild_id)
+
+    async def _start_shared_state(self):
+        shared = SharedState(str(cog_data_path(self) / SHARED_DB_NAME))
+        try:
+            await shared.open()
+        except sqlite3.Error as exc:
+            await shared.close()
+            await self._log_console(
+                f"shared state unavailable: {exc}", level=logging.ERROR, stage="shared"
+            )
+            return
+        self._shared = shared
+        self._shared_poller = asyncio.create_task(self._shared_poll_loop())
+
+    async def _stop_shared_state(self):
+        if self._shared_poller is not None:
+            self._shared_poller.cancel()
+            self._shared_poller = None
+        if self._shared is not None:
+            shared, self._shared = self._shared, None
+            await shared.close()
+
+    async def _publish_change(self, kind: str, guild_id: Optional[int] = None):
+        """다른 샤드 프로세스에 캐시를 다시 읽으라고 알린다(공유 상태를 켠 경우만)."""
+        if self._shared is None:
+            return
+        try:
+            await self._shared.publish(kind, guild_id)
+        except sqlite3.Error as exc:
+            await self._log_console(
+                f"shared publish failed: {exc}", level=logging.WARNING, guild_id=guild_id, stage="shared"
+            )
+
+    async def _shared_poll_loop(self):
+        last_prune = time.monotonic()
+        while True:
+            await asyncio.sleep(SHARED_POLL_INTERVAL)
+            try:
+                for kind, guild_id in set(await self._shared.poll()):
+                    await self._reload_shared(kind, guild_id)
+                if time.monotonic() - last_prune >= SHARED_PRUNE_INTERVAL:
+                    last_prune = time.monotonic()
+                    await self._shared.prune(LOG_COOLDOWN_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await self._log_console(
+                    f"shared poll failed: {exc}", level=logging.ERROR, stage="shared"
+                )
+
+    async def _reload_shared(self, kind: str, guild_id: Optional[int]):
+        if kind == "allowlist" and guild_id is not None:
+            await self._allowlist.reload_guild(guild_id)
+        elif kind == "settings" and guild_id is not None:
+            self._settings[guild_id] = await self.config.guild_from_id(guild_id).all()
+        elif kind == "trusted":
+            trusted = await self.config.trusted_bots()
+            self._trusted_bots = {int(bot_id): record for bot_id, record in trusted.items()}
+
+    async def _migrate_legacy_allowlists(self):
+        legacy = {
+            guild_id: settings["allowlist"]
+            for guild_id, settings in self._settings.items()
+            if settings.get("allowlist")
+        }
+        await asyncio.gather(
+            *(self._migrate_legacy_allowlist(guild_id, entries) for guild_id, entries in legacy.items())
+        )
+
+    async def _migrate_legacy_allowlist(self, guild_id: int, entries: Dict[str, Dict[str, Any]]):
+        await self._allowlist.import_legacy(guild_id, entries)
+        await self._set_setting(guild_id, "allowlist", {})
 
     async def _maybe_warn_intents(self):
         if self._intents_warned:
             return
         self._intents_warned = True
         if not self.bot.intents.members:
-            await self._log_console("[BotGate] WARNING: members intent가 꺼져 있습니다.")
+            await self._log_console(
+                "members intent가 꺼져 있습니다. 봇 입장은 audit log BOT_ADD로만 감지합니다."
+                if self.bot.intents.moderation
+                else "members/moderation intent가 모두 꺼져 있어 봇 입장을 감지할 수 없습니다.",
+                level=logging.WARNING,
+            )
             await self._broadcast_intent_warning()
 
     async def _broadcast_intent_warning(self):
-        for guild in self.bot.guilds:
-            log_channel_id = await self.config.guild(guild).log_channel_id()
+        result = await self._broadcast_view(INTENT_WARNING.static)
+        await self._log_console(
+            f"intent warning sent to {len(result.succeeded)} guilds, failed {len(result.failed)}",
+            level=logging.WARNING if result.failed else logging.INFO,
+            stage="broadcast",
+        )
+
+    async def _broadcast_view(
+        self, build_view: Callable[[], discord.ui.LayoutView]
+    ) -> FanOutResult:
+        """로그 채널이 설정된 모든 길드에 view를 보낸다. 대상은 설정 스냅샷에서 한 번에 고른다."""
+        targets = []
+        for guild_id, settings in list(self._settings.items()):
+            log_channel_id = settings["log_channel_id"]
             if not log_channel_id:
                 continue
-            channel = guild.get_channel(log_channel_id)
-            if not channel:
-                continue
-            try:
-                view = BotGateLayoutView(
-                    title="⚠️ BotGate 경고",
-                    lines=["members intent가 꺼져 있어 봇 입장 감지가 동작하지 않을 수 있습니다."],
-                    accent_color=int(discord.Color.orange()),
-                    use_container=True,
-                )
-                await channel.send(view=view)
-            except Exception:
+            guild = self.bot.get_guild(guild_id)
+            channel = guild.get_channel(log_channel_id) if guild else None
+            if channel is None:
                 continue
+            targets.append((guild_id, channel))
+        return await fan_out(targets, lambda channel: channel.send(view=build_view()))
 
-    async def _log_console(self, message: str):
-        print(message)
-
-    async def _send_log(
+    async def _log_console(
         self,
-        guild: discord.Guild,
-        view: discord.ui.LayoutView,
+        message: str,
         *,
-        content: Optional[str] = None,
+        level: int = logging.INFO,
+        guild_id: Optional[int] = None,
+        bot_id: Optional[int] = None,
+        stage: Optional[str] = None,
     ):
-        log_channel_id = await self.config.guild(guild).log_channel_id()
-        if not log_channel_id:
-            await self._log_console(f"[BotGate] log channel not set: {guild.id}")
+        self._console.log(level, message, guild_id=guild_id, bot_id=bot_id, stage=stage)
+
+    async def _send_log(self, guild: discord.Guild, view: discord.ui.LayoutView):
+        if not self._guild_settings(guild.id)["log_channel_id"]:
+            await self._log_console(
+                "log channel not set", level=logging.WARNING, guild_id=guild.id, stage="log"
+            )
             return
-        channel = guild.get_channel(log_channel_id)
+        if not self._log_dispatcher.submit(guild.id, view):
+            self._metrics.incr("logs_dropped")
+
+    async def _flush_logs(self, guild_id: int, views: List[discord.ui.LayoutView], dropped: int):
+        guild = self.bot.get_guild(guild_id)
+        if not guild:
+            return
+        log_channel_id = self._guild_settings(guild_id)["log_channel_id"]
+        channel = guild.get_channel(log_channel_id) if log_channel_id else None
         if not channel:
-            await self._log_console(f"[BotGate] log channel missing: {guild.id}")
+            await self._log_console(
+                "log channel missing", level=logging.WARNING, guild_id=guild_id, stage="log"
+            )
             return
-        try:
-            message = await channel.send(content=content, view=view)
+        if dropped:
+            views.append(
+                BotGateLayoutView(
+                    lines=[f"⚠️ 로그 대기열이 가득 차 {dropped}건을 생략했습니다."],
+                    accent_color=int(discord.Color.orange()),
+                    use_container=True,
+                )
+            )
+        for view in _merge_layout_views(views):
             try:
-                self.bot.add_view(view, message_id=message.id)
-            except Exception:
-                pass
-            if getattr(view, "tracks_approval", False):
-                bot_id = getattr(view, "bot_id", None)
-                if bot_id is not None:
-                    await self._store_pending_approval(guild.id, bot_id, message.id)
-        except Exception as exc:
-            await self._log_console(f"[BotGate] failed to log: {exc}")
+                with self._metrics.timer("log.send"):
+                    message = await channel.send(view=view)
+            except Exception as exc:
+                self._metrics.incr("log_send_failures")
+                await self._log_console(
+                    f"failed to log: {exc}", level=logging.ERROR, guild_id=guild_id, stage="log"
+                )
+                continue
+            self._metrics.incr("logs_sent")
+            # 승인 버튼은 ApproveButton 템플릿이 처리하므로 메시지별 view를 보관하지 않는다.
+            view.stop()
+            for bot_id in view.pending_bot_ids:
+                if not self._allowlist.contains(guild_id, bot_id):
+                    await self._store_pending_approval(guild_id, bot_id, channel.id, message.id)
 
     async def _send_command_view(
         self,
@@ -244,46 +972,97 @@ class BotGate(commands.Cog):
         skip_if_log_channel: bool = False,
     ) -> None:
         if skip_if_log_channel and ctx.guild:
-            log_channel_id = await self.config.guild(ctx.guild).log_channel_id()
+            log_channel_id = self._guild_settings(ctx.guild.id)["log_channel_id"]
             if log_channel_id and ctx.channel and log_channel_id == ctx.channel.id:
                 return
         await ctx.send(view=view)
 
-    async def _send_help_view(
-        self,
-        ctx: commands.Context,
-        title: str,
-        lines: List[str],
-    ) -> None:
-        view = BotGateLayoutView(
-            title=title,
-            lines=lines,
-            accent_color=int(discord.Color.blurple()),
-            use_container=True,
-        )
-        await ctx.send(view=view)
-
-    def _cooldown_hit(self, guild_id: int, bot_id: int) -> bool:
+    async def _cooldown_hit(self, guild_id: int, bot_id: int) -> bool:
         now = discord.utils.utcnow()
         key = (guild_id, bot_id)
         last = self._log_cooldown.get(key)
         if last and (now - last).total_seconds() < LOG_COOLDOWN_SECONDS:
+            self._metrics.incr("cooldown_suppressed")
             return True
         self._log_cooldown[key] = now
+        if self._shared is not None and await self._shared_cooldown_hit(guild_id, bot_id):
+            self._metrics.incr("cooldown_suppressed")
+            return True
         return False
 
+    async def _shared_cooldown_hit(self, guild_id: int, bot_id: int) -> bool:
+        # 다른 샤드로 옮겨 다시 들어온 봇도 같은 쿨다운을 적용받는다. 실패하면 로컬 판정만 쓴다.
+        try:
+            return await self._shared.cooldown_hit(guild_id, bot_id, LOG_COOLDOWN_SECONDS)
+        except sqlite3.Error as exc:
+            await self._log_console(
+                f"shared cooldown failed: {exc}", level=logging.WARNING, guild_id=guild_id, stage="shared"
+            )
+            return False
+
     def _oauth_url(self, bot_id: int) -> str:
         return (
             "https://discord.com/oauth2/authorize"
             f"?client_id={bot_id}&permissions=8&integration_type=0&scope=bot"
         )
 
+    def _start_button_approval(self, interaction: discord.Interaction, bot_id: int, clicked: float) -> bool:
+        """이미 같은 봇 승인이 진행 중이면 False"""
+        key = (interaction.guild.id, bot_id)
+        if key in self._approval_tasks:
+            return False
+        task = asyncio.create_task(self._run_button_approval(interaction, bot_id, clicked))
+        self._approval_tasks[key] = task
+        task.add_done_callback(lambda _: self._approval_tasks.pop(key, None))
+        return True
+
+    async def _run_button_approval(self, interaction: discord.Interaction, bot_id: int, clicked: float):
+        guild = interaction.guild
+        try:
+            if not await self._user_can_approve(interaction.user, guild):
+                message = "승인 권한이 없습니다."
+            else:
+                await self._approve_bot(guild, bot_id, approved_by=interaction.user.id, source="button")
+                message = "승인 완료. 허용 목록에 추가했습니다."
+        except Exception as exc:
+            await self._log_console(
+                f"button approval failed: {str(exc)[:200]}",
+                level=logging.ERROR,
+                guild_id=guild.id,
+                bot_id=bot_id,
+                stage="approve",
+            )
+            message = f"승인 처리 중 오류가 발생했습니다. `[p]botgate allow {bot_id}`로 다시 시도해 주세요."
+        self._metrics.observe("approve.click_to_complete", time.perf_counter() - clicked)
+        try:
+            await interaction.followup.send(message, ephemeral=True)
+        except discord.HTTPException:
+            # 응답 토큰(15분)이 만료됐거나 채널에 접근할 수 없는 경우. 승인 자체는 끝났다.
+            pass
+
     async def _approve_bot(self, guild: discord.Guild, bot_id: int, approved_by: int, source: str):
-        now = discord.utils.utcnow().isoformat()
-        allowlist = await self.config.guild(guild).allowlist()
-        allowlist[str(bot_id)] = {"approved_by": approved_by, "approved_at": now}
-        await self.config.guild(guild).allowlist.set(allowlist)
+        if self._trace is not None:
+            self._trace.record("approve", guild.id, bot_id=bot_id, user_id=approved_by, src=source)
+        with self._metrics.timer("approve.total"):
+            await self._approve_bot_inner(guild, bot_id, approved_by, source)
+        self._metrics.incr("approvals")
 
+    async def _approve_bot_inner(
+        self, guild: discord.Guild, bot_id: int, approved_by: int, source: str
+    ):
+        with self._metrics.timer("approve.allowlist_write"):
+            await self._allowlist.add(guild.id, bot_id, AllowRecord(approved_by, int(time.time())))
+        await self._forgive_rejoins(guild.id, [bot_id])
+
+        pending = self._pending.get(guild.id, bot_id)
+        if pending and await self._mark_alerts_approved(guild, {bot_id: pending["alerts"]}, approved_by, source):
+            await self._remove_pending_approval(guild.id, bot_id)
+            member = guild.get_member(bot_id)
+            if member and member.bot:
+                await self._assign_role_if_needed(member)
+            return
+
+        # 원래 알림이 없거나(명령 승인) 더 이상 찾을 수 없을 때만 새 로그를 보낸다.
         url = self._oauth_url(bot_id)
         view = BotGateLayoutView(
             title="✅ 봇 승인 완료",
@@ -304,119 +1083,622 @@ class BotGate(commands.Cog):
         if member and member.bot:
             await self._assign_role_if_needed(member)
 
+    async def _approve_bots(
+        self,
+        guild: discord.Guild,
+        entries: Dict[int, Optional[AllowRecord]],
+        approved_by: int,
+        source: str,
+    ) -> List[int]:
+        """여러 봇을 한 번에 허용한다. 허용 목록/승인 대기 쓰기는 각각 한 번, 로그는 요약 1건만 보낸다."""
+        if self._trace is not None:
+            self._trace.record(
+                "approve_bulk",
+                guild.id,
+                user_id=approved_by,
+                src=source,
+                bs=[self._trace.anonymize(bot_id) for bot_id in entries],
+            )
+        with self._metrics.timer("approve.total"):
+            added = await self._approve_bots_inner(guild, entries, approved_by, source)
+        self._metrics.incr("approvals", len(added))
+        return added
+
+    async def _approve_bots_inner(
+        self,
+        guild: discord.Guild,
+        entries: Dict[int, Optional[AllowRecord]],
+        approved_by: int,
+        source: str,
+    ) -> List[int]:
+        current = self._allowlist.for_guild(guild.id)
+        now = int(time.time())
+        added = {
+            bot_id: record or AllowRecord(approved_by, now)
+            for bot_id, record in entries.items()
+            if bot_id not in current
+        }
+        if not added:
+            return []
+        with self._metrics.timer("approve.allowlist_write"):
+            await self._allowlist.replace_guild(guild.id, {**current, **added})
+        await self._publish_change("allowlist", guild.id)
+        await self._forgive_rejoins(guild.id, added)
+
+        pending = self._pending.for_guild(guild.id)
+        if any(bot_id in pending for bot_id in added):
+            await self._mark_alerts_approved(
+                guild,
+                {bot_id: pending[bot_id]["alerts"] for bot_id in added if bot_id in pending},
+                approved_by,
+                source,
+            )
+            # 알림 수정 중에 다른 알림이 추가될 수 있으므로 이전 스냅샷으로 길드를 덮지 않고 행별로 지운다.
+            for bot_id in added:
+                await self._pending.remove(guild.id, bot_id)
+
+        ids = sorted(added)
+        preview = " ".join(f"`{bot_id}`" for bot_id in ids[:BULK_LOG_PREVIEW])
+        if len(ids) > BULK_LOG_PREVIEW:
+            preview += f" 외 {len(ids) - BULK_LOG_PREVIEW}개"
+        view = BotGateLayoutView(
+            title="✅ 봇 일괄 승인 완료",
+            lines=[
+                f"승인자: <@{approved_by}>",
+                f"승인한 봇: {len(ids)}개",
+                preview,
+                f"승인 시각: <t:{int(discord.utils.utcnow().timestamp())}:F>",
+            ],
+            footer=f"승인 경로: {source}",
+            accent_color=int(discord.Color.green()),
+            use_container=True,
+        )
+        await self._send_log(guild, view)
+
+        for bot_id in ids:
+            member = guild.get_member(bot_id)
+            if member and member.bot:
+                await self._assign_role_if_needed(member)
+        return ids
+
     async def _user_can_approve(self, user: discord.abc.User, guild: discord.Guild) -> bool:
         if await self.bot.is_owner(user):
             return True
-        conf = self.config.guild(guild)
-        owner_always = await conf.approver_owner_always()
-        if owner_always and user.id == guild.owner_id:
+        settings = self._guild_settings(guild.id)
+        if settings["approver_owner_always"] and user.id == guild.owner_id:
             return True
-        user_ids = await conf.approver_user_ids()
-        if user.id in user_ids:
+        if user.id in settings["approver_user_ids"]:
             return True
-        role_ids = await conf.approver_role_ids()
+        role_ids = settings["approver_role_ids"]
         member = guild.get_member(user.id)
         if member:
             return any(role.id in role_ids for role in member.roles)
         return False
 
-    async def _is_allowed(self, guild: discord.Guild, bot_id: int) -> bool:
-        allowlist = await self.config.guild(guild).allowlist()
-        return str(bot_id) in allowlist
+    async def _user_can_browse(self, user: discord.abc.User, guild: discord.Guild) -> bool:
+        member = guild.get_member(user.id)
+        if member is not None:
+            if member.guild_permissions.administrator or await self.bot.is_admin(member):
+                return True
+        return await self._user_can_approve(user, guild)
+
+    def _is_allowed(self, guild: discord.Guild, bot_id: int) -> bool:
+        if bot_id in self._trusted_bots and self._guild_settings(guild.id)["use_global_trust"]:
+            return True
+        return self._allowlist.contains(guild.id, bot_id)
 
-    async def _assign_role_if_needed(self, member: discord.Member):
-        role_id = await self.config.guild(member.guild).approved_role_id()
+    async def _assign_role_if_needed(self, member: discord.Member) -> bool:
+        role_id = self._guild_settings(member.guild.id)["approved_role_id"]
         if not role_id:
-            return
+            return False
         role = member.guild.get_role(role_id)
         if not role:
-            return
+            return False
+        if member.get_role(role_id) is not None:
+            return False
         bot_member = member.guild.me
         if not bot_member or not bot_member.guild_permissions.manage_roles:
-            return
+            return False
         if role >= bot_member.top_role:
-            return
+            return False
         try:
-            await member.add_roles(role, reason="BotGate 승인 봇 자동 역할 부여")
-        except Exception:
-            return
+            with self._metrics.timer("role.assign"):
+                await self._moderation.run(
+                    member.guild.id,
+                    lambda: member.add_roles(role, reason="BotGate 승인 봇 자동 역할 부여"),
+                )
+        except Exception as exc:
+            self._metrics.incr("role_failures")
+            await self._log_console(
+                f"role assign failed: {str(exc)[:200]}",
+                level=logging.WARNING,
+                guild_id=member.guild.id,
+                bot_id=member.id,
+                stage="role",
+            )
+            return False
+        self._metrics.incr("roles_assigned")
+        return True
 
-    async def _store_pending_approval(self, guild_id: int, bot_id: int, message_id: int):
-        conf = self.config.guild_from_id(guild_id)
-        pending = await conf.pending_approvals()
-        for entry in pending:
-            if entry.get("bot_id") == bot_id and entry.get("message_id") == message_id:
-                return
-        pending.append({"bot_id": bot_id, "message_id": message_id})
-        await conf.pending_approvals.set(pending[-200:])
+    async def _store_pending_approval(
+        self, guild_id: int, bot_id: int, channel_id: int, message_id: int
+    ):
+        if (
+            not self._pending.contains(guild_id, bot_id)
+            and self._pending.count(guild_id) >= PENDING_MAX_PER_GUILD
+        ):
+            oldest = self._pending.oldest(guild_id)
+            if oldest is not None:
+                await self._pending.remove(guild_id, oldest)
+                await self._log_console(
+                    f"pending approvals full ({PENDING_MAX_PER_GUILD}), dropped oldest entry",
+                    level=logging.WARNING,
+                    guild_id=guild_id,
+                    bot_id=oldest,
+                    stage="pending",
+                )
+        await self._pending.add_alert(guild_id, bot_id, channel_id, message_id, time.time())
 
     async def _remove_pending_approval(self, guild_id: int, bot_id: int):
-        conf = self.config.guild_from_id(guild_id)
-        pending = await conf.pending_approvals()
-        new_pending = [entry for entry in pending if entry.get("bot_id") != bot_id]
-        if len(new_pending) != len(pending):
-            await conf.pending_approvals.set(new_pending)
+        await self._pending.remove(guild_id, bot_id)
+
+    async def _mark_alerts_approved(
+        self,
+        guild: discord.Guild,
+        alerts: Dict[int, List[List[Optional[int]]]],
+        approved_by: int,
+        source: str,
+    ) -> Set[int]:
+        """감지 알림을 제자리에서 승인 상태로 고친다. 메시지마다 한 번만 수정하고, 고친 봇 ID를 돌려준다."""
+        log_channel_id = self._guild_settings(guild.id)["log_channel_id"]
+        by_message: Dict[Tuple[int, int], List[int]] = {}
+        for bot_id, entries in alerts.items():
+            for channel_id, message_id in entries:
+                resolved_id = channel_id or log_channel_id
+                if resolved_id:
+                    by_message.setdefault((resolved_id, message_id), []).append(bot_id)
+
+        line = f"✅ <@{approved_by}> 승인 · <t:{int(time.time())}:R> · {source}"
+        marked: Set[int] = set()
+        lock = self._alert_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            for (channel_id, message_id), bot_ids in by_message.items():
+                channel = guild.get_channel(channel_id)
+                if channel is None:
+                    continue
+                try:
+                    with self._metrics.timer("approve.alert_edit"):
+                        marked |= await self._edit_alert(channel, message_id, bot_ids, line)
+                except discord.NotFound:
+                    self._edited_alerts.pop(message_id, None)
+                except Exception as exc:
+                    self._metrics.incr("alert_edit_failures")
+                    await self._log_console(
+                        f"failed to edit alert {message_id}: {str(exc)[:200]}",
+                        level=logging.WARNING,
+                        guild_id=guild.id,
+                        stage="log",
+                    )
+        self._metrics.incr("alerts_edited", len(marked))
+        return marked
+
+    async def _edit_alert(
+        self, channel: discord.abc.Messageable, message_id: int, bot_ids: List[int], line: str
+    ) -> Set[int]:
+        message = self._edited_alerts.pop(message_id, None) or discord.utils.get(
+            self.bot.cached_messages, id=message_id
+        )
+        if message is None:
+            message = await channel.fetch_message(message_id)
+        view = discord.ui.LayoutView.from_message(message, timeout=None)
+        marked = _mark_alert_approved(view, bot_ids, channel.guild.id, line)
+        if not marked:
+            # 이미 다른 경로로 버튼이 빠진 알림
+            return set(bot_ids)
+        edited = await message.edit(view=view)
+        # 남은 승인 버튼은 ApproveButton 템플릿이 처리하므로 메시지별 view를 보관하지 않는다.
+        view.stop()
+        self._edited_alerts[message_id] = edited
+        while len(self._edited_alerts) > EDITED_ALERT_CACHE_SIZE:
+            self._edited_alerts.popitem(last=False)
+        return marked
 
     async def _restore_pending_views(self):
-        for guild in self.bot.guilds:
-            conf = self.config.guild(guild)
-            pending = await conf.pending_approvals()
-            if not pending:
+        # 버튼 자체는 cog_load에서 등록한 ApproveButton 템플릿이 처리한다.
+        # 여기서는 cog_load의 스냅샷에 남은 예전 목록형 pending_approvals만 PendingStore로 옮긴다.
+        writes = []
+        now = time.time()
+        for guild_id, settings in self._settings.items():
+            legacy = settings.get("pending_approvals")
+            if not legacy:
                 continue
-            cleaned = []
-            for entry in pending:
+            entries = dict(self._pending.for_guild(guild_id))
+            for entry in legacy:
                 bot_id = entry.get("bot_id")
                 message_id = entry.get("message_id")
                 if not bot_id or not message_id:
                     continue
-                view = ApproveLayoutView(self, guild.id, bot_id)
-                try:
-                    self.bot.add_view(view, message_id=message_id)
-                    cleaned.append(entry)
-                except Exception:
+                existing = entries.get(bot_id)
+                alerts = list(existing["alerts"]) if existing else []
+                alerts.append([None, message_id])
+                entries[bot_id] = {
+                    "created_at": existing["created_at"] if existing else now,
+                    "alerts": alerts,
+                }
+            writes.append(self._migrate_legacy_pending(guild_id, entries))
+        await asyncio.gather(*writes)
+
+    async def _migrate_legacy_pending(self, guild_id: int, entries: Dict[int, Dict[str, Any]]):
+        await self._pending.replace_guild(guild_id, entries)
+        await self._set_setting(guild_id, "pending_approvals", [])
+
+    async def _pending_sweep_loop(self):
+        await self.bot.wait_until_red_ready()
+        while True:
+            try:
+                await self._sweep_pending()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await self._log_console(
+                    f"pending sweep failed: {exc}", level=logging.ERROR, stage="pending"
+                )
+            await asyncio.sleep(PENDING_SWEEP_INTERVAL)
+
+    async def _sweep_pending(self):
+        """TTL이 지난 항목과 알림 메시지가 삭제된 항목을 정리한다.
+
+        메시지 확인은 오래 걸리므로 지울 대상만 모은 뒤 현재 저장소에 행 단위로 반영한다.
+        확인하는 동안 추가/승인된 항목은 그대로 둔다.
+        """
+        for guild_id in list(self._pending.guild_ids()):
+            entries = dict(self._pending.for_guild(guild_id))
+            if not entries:
+                continue
+            ttl = self._guild_settings(guild_id)["pending_ttl_hours"] * 3600
+            now = time.time()
+            for bot_id, entry in entries.items():
+                if now - entry["created_at"] < ttl:
                     continue
-            if len(cleaned) != len(pending):
-                await conf.pending_approvals.set(cleaned)
+                live = self._pending.get(guild_id, bot_id)
+                if live is not None and live["created_at"] == entry["created_at"]:
+                    await self._pending.remove(guild_id, bot_id)
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                continue
+            kept = {bot_id: entry for bot_id, entry in entries.items() if now - entry["created_at"] < ttl}
+            deleted = await self._find_deleted_alerts(guild, kept)
+            for bot_id, gone in deleted.items():
+                live = self._pending.get(guild_id, bot_id)
+                if live is None:
+                    continue
+                alerts = [alert for alert in live["alerts"] if alert not in gone]
+                if not alerts:
+                    await self._pending.remove(guild_id, bot_id)
+                elif len(alerts) != len(live["alerts"]):
+                    await self._pending.add(guild_id, bot_id, {"created_at": live["created_at"], "alerts": alerts})
+
+    async def _find_deleted_alerts(
+        self, guild: discord.Guild, entries: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, List[List[Optional[int]]]]:
+        """bot_id -> 삭제됐거나 채널이 사라진 알림 [channel_id, message_id] 목록"""
+        log_channel_id = self._guild_settings(guild.id)["log_channel_id"]
+        checked = 0
+        result: Dict[int, List[List[Optional[int]]]] = {}
+        for bot_id, entry in entries.items():
+            gone = []
+            for channel_id, message_id in entry["alerts"]:
+                resolved_id = channel_id or log_channel_id
+                if not resolved_id:
+                    continue
+                channel = guild.get_channel(resolved_id)
+                if channel is None:
+                    if channel_id:
+                        gone.append([channel_id, message_id])
+                    continue
+                if checked and checked % PENDING_CHECK_BATCH == 0:
+                    await asyncio.sleep(PENDING_CHECK_PAUSE)
+                checked += 1
+                try:
+                    await channel.fetch_message(message_id)
+                except discord.NotFound:
+                    gone.append([channel_id, message_id])
+                except discord.HTTPException:
+                    pass
+            if gone:
+                result[bot_id] = gone
+        return result
+
+    async def _metrics_export_loop(self):
+        while True:
+            await asyncio.sleep(METRICS_EXPORT_INTERVAL)
+            if not self._metrics_path:
+                continue
+            try:
+                await self._export_metrics(self._metrics_path)
+            except Exception as exc:
+                await self._log_console(
+                    f"metrics export failed: {exc}", level=logging.ERROR, stage="metrics"
+                )
+
+    async def _export_metrics(self, path: str):
+        text = self._metrics.render_prometheus()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, _write_text_atomic, path, text)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if not member.guild:
+            return
+        if not member.bot:
+            return
+        if not self.bot.user or member.id == self.bot.user.id:
+            return
+
+        await self._maybe_warn_intents()
+
+        started = time.perf_counter()
+        first = self._claim_join_signal(member.guild.id, member.id, "member_join")
+        settings = self._guild_settings(member.guild.id)
+        if not settings["enabled"]:
+            if self._trace is not None:
+                self._trace.record("join", member.guild.id, bot_id=member.id, d="off")
+            return
+        allowed = self._is_allowed(member.guild, member.id)
+        self._metrics.observe("join.decision", time.perf_counter() - started)
+        if not allowed and not first:
+            # audit log 경로에서 이미 킥 대기열에 넣은 입장
+            return
+        if self._trace is not None:
+            self._trace.record("join", member.guild.id, bot_id=member.id, d="allow" if allowed else "kick")
+
+        if allowed:
+            self._metrics.incr("joins_allowed")
+            await self._assign_role_if_needed(member)
+            if not await self._cooldown_hit(member.guild.id, member.id):
+                view = APPROVED_JOIN.render([f"{member}(`{member.id}`)"])
+                await self._send_log(member.guild, view)
+            self._metrics.observe("join.total", time.perf_counter() - started)
+            return
+
+        self._enqueue_unapproved(member, settings)
+        self._metrics.observe("join.total", time.perf_counter() - started)
 
     @commands.Cog.listener()
-    async def on_member_join(self, member: discord.Member):
-        if not member.guild:
-            return
-        if not member.bot:
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
+        """members intent 없이도, 또는 GUILD_MEMBER_ADD보다 먼저 봇 추가를 감지한다.
+
+        moderation intent와 `View Audit Log` 권한이 필요하다. 승인된 봇의 역할 부여/입장 로그는
+        Member가 필요하므로 member join 쪽에 맡기고, 여기서는 미승인 봇 킥만 처리한다.
+        """
+        if entry.action is not discord.AuditLogAction.bot_add:
             return
-        if not self.bot.user or member.id == self.bot.user.id:
+        bot_id = getattr(entry.target, "id", None)
+        if bot_id is None or not self.bot.user or bot_id == self.bot.user.id:
             return
 
         await self._maybe_warn_intents()
 
-        enabled = await self.config.guild(member.guild).enabled()
-        if not enabled:
+        started = time.perf_counter()
+        guild = entry.guild
+        if not self._claim_join_signal(guild.id, bot_id, "audit_log"):
             return
-
-        allowed = await self._is_allowed(member.guild, member.id)
-        if allowed:
-            await self._assign_role_if_needed(member)
-            if not self._cooldown_hit(member.guild.id, member.id):
-                view = BotGateLayoutView(
-                    title="✅ 승인된 봇 입장 확인",
-                    lines=[f"{member}(`{member.id}`)"],
-                    accent_color=int(discord.Color.green()),
-                    use_container=True,
-                )
-                await self._send_log(member.guild, view)
+        settings = self._guild_settings(guild.id)
+        if not settings["enabled"] or self._is_allowed(guild, bot_id):
             return
+        self._metrics.observe("join.decision", time.perf_counter() - started)
+        if self._trace is not None:
+            self._trace.record("join", guild.id, bot_id=bot_id, d="kick", via="audit_log")
+        self._enqueue_unapproved(guild.get_member(bot_id) or _AuditLogBot(guild, bot_id), settings)
+        self._metrics.observe("join.total", time.perf_counter() - started)
+
+    def _claim_join_signal(self, guild_id: int, bot_id: int, path: str) -> bool:
+        """같은 입장에 대해 먼저 온 신호면 True. 다른 경로의 두 번째 신호는 False로 걸러 낸다."""
+        now = time.monotonic()
+        while self._join_signals:
+            key, (_, seen_at) = next(iter(self._join_signals.items()))
+            if now - seen_at < JOIN_SIGNAL_TTL:
+                break
+            del self._join_signals[key]
+
+        key = (guild_id, bot_id)
+        first = self._join_signals.pop(key, None)
+        if first is not None and first[0] != path:
+            self._metrics.incr(f"join_signal_second_{path}")
+            self._metrics.observe("join.signal_gap", now - first[1])
+            return False
+        # 같은 경로로 다시 온 신호는 재입장이다.
+        self._join_signals[key] = (path, now)
+        self._metrics.incr(f"join_signal_first_{path}")
+        return True
+
+    def _enqueue_unapproved(self, member: discord.Member, settings: Dict[str, Any]):
+        self._metrics.incr("joins_unapproved")
+        now = time.monotonic()
+        self._raid_state(member.guild.id).record_join(
+            now, settings["raid_threshold"], settings["raid_window_seconds"]
+        )
+        rejoins = self._rejoin_tracker(member.guild.id).record(member.id, now, settings["rejoin_window_seconds"])
+        if settings["rejoin_ban_threshold"] and rejoins >= settings["rejoin_ban_threshold"]:
+            self._escalate.add((member.guild.id, member.id))
+        self._kick_queue(member.guild.id).enqueue(member)
+
+    async def cog_before_invoke(self, ctx: commands.Context):
+        if self._trace is not None and ctx.guild is not None:
+            self._trace.record("command", ctx.guild.id, user_id=ctx.author.id, name=ctx.command.qualified_name)
+
+    def _kick_queue(self, guild_id: int) -> KickQueue:
+        queue = self._kick_queues.get(guild_id)
+        if queue is None:
+            queue = KickQueue(self._kick_member, self._on_kick_done)
+            self._kick_queues[guild_id] = queue
+        return queue
+
+    async def _kick_member(self, member: discord.Member) -> Optional[Dict[str, Any]]:
+        """미승인 봇을 킥한다. 재입장 차단으로 대신했으면 그 차단 기록을, 킥했으면 None을 돌려준다."""
+        key = (member.guild.id, member.id)
+        if key in self._escalate:
+            self._escalate.discard(key)
+            ban = await self._ban_member(member)
+            if ban is not None:
+                return ban
+        with self._metrics.timer("join.kick"):
+            await self._moderation.run(member.guild.id, lambda: member.kick(reason=KICK_REASON))
+        return None
+
+    async def _on_moderation_retry(self, guild_id: int, exc: BaseException, delay: float):
+        self._metrics.incr("moderation_retries")
+        await self._log_console(
+            f"moderation call failed, retrying in {delay:.2f}s: {str(exc)[:200]}",
+            level=logging.WARNING,
+            guild_id=guild_id,
+            stage="retry",
+        )
+
+    def _rejoin_tracker(self, guild_id: int) -> RejoinTracker:
+        tracker = self._rejoins.get(guild_id)
+        if tracker is None:
+            tracker = RejoinTracker()
+            self._rejoins[guild_id] = tracker
+        return tracker
 
-        kick_result = "킥 성공"
-        kick_error = None
+    async def _ban_member(self, member: discord.Member) -> Optional[Dict[str, Any]]:
+        """킥해도 다시 들어오는 봇을 rejoin_ban_hours 동안 차단하고 차단 기록을 돌려준다. 실패하면 None(호출자가 킥으로 처리)."""
+        guild = member.guild
+        hours = self._guild_settings(guild.id)["rejoin_ban_hours"]
         try:
-            await member.kick(reason="BotGate: 미승인 봇 자동 킥")
+            with self._metrics.timer("join.ban"):
+                await self._moderation.run(
+                    guild.id, lambda: guild.ban(member, reason=BAN_REASON, delete_message_seconds=0)
+                )
         except Exception as exc:
-            kick_result = "킥 실패"
-            kick_error = str(exc)
+            self._metrics.incr("rejoin_ban_failures")
+            await self._log_console(
+                f"rejoin ban failed, kicking instead: {str(exc)[:200]}",
+                level=logging.WARNING,
+                guild_id=guild.id,
+                bot_id=member.id,
+                stage="ban",
+            )
+            return None
+        ban = {"until": int(time.time()) + hours * 3600}
+        await self._bans.add(guild.id, member.id, ban)
+        self._rejoin_tracker(guild.id).forget(member.id)
+        self._metrics.incr("rejoin_bans")
+        self._unban_wakeup.set()
+        return ban
+
+    async def _unban_loop(self):
+        # 게이트웨이 연결 전에는 길드 캐시가 비어 있어 나간 길드와 구분할 수 없다.
+        await self.bot.wait_until_red_ready()
+        while True:
+            self._unban_wakeup.clear()
+            delay = UNBAN_CHECK_INTERVAL
+            next_expiry = self._bans.next_expiry()
+            if next_expiry is not None:
+                delay = min(delay, max(0.0, next_expiry - time.time()))
+            try:
+                await asyncio.wait_for(self._unban_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            failed = False
+            for guild_id, bot_id in self._bans.expired(time.time()):
+                try:
+                    await self._unban(guild_id, bot_id)
+                except Exception as exc:
+                    failed = True
+                    await self._log_console(
+                        f"unban failed: {str(exc)[:200]}",
+                        level=logging.ERROR,
+                        guild_id=guild_id,
+                        bot_id=bot_id,
+                        stage="ban",
+                    )
+            if failed:
+                # 만료된 기록이 남아 있으므로 바로 다시 돌지 않고 한 주기 뒤에 재시도한다.
+                await asyncio.sleep(UNBAN_CHECK_INTERVAL)
 
-        if self._cooldown_hit(member.guild.id, member.id):
+    async def _unban(self, guild_id: int, bot_id: int):
+        """차단을 풀고 기록을 지운다. 실패하면 기록을 남긴 채 예외를 올려 다음 주기에 다시 시도하게 한다."""
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            # 준비가 끝난 뒤에도 캐시에 없으면 봇이 나간 길드다. 풀 수단이 없으므로 기록만 지운다.
+            await self._log_console(
+                "guild gone, dropping ban record", level=logging.WARNING, guild_id=guild_id, bot_id=bot_id, stage="ban"
+            )
+            await self._bans.remove(guild_id, bot_id)
+            return
+        if guild.unavailable:
+            raise RuntimeError("guild unavailable")
+        try:
+            await self._moderation.run(
+                guild_id, lambda: guild.unban(discord.Object(id=bot_id), reason=UNBAN_REASON)
+            )
+        except discord.NotFound:
+            # 이미 수동으로 풀린 차단
+            pass
+        await self._bans.remove(guild_id, bot_id)
+        self._metrics.incr("rejoin_unbans")
+
+    async def _forgive_rejoins(self, guild_id: int, bot_ids: Iterable[int]):
+        """승인된 봇은 재입장 기록을 지우고, 임시 차단 중이면 바로 해제한다."""
+        tracker = self._rejoin_tracker(guild_id)
+        for bot_id in bot_ids:
+            tracker.forget(bot_id)
+            self._escalate.discard((guild_id, bot_id))
+            if not self._bans.contains(guild_id, bot_id):
+                continue
+            try:
+                await self._unban(guild_id, bot_id)
+            except Exception as exc:
+                await self._log_console(
+                    f"unban on approval failed: {str(exc)[:200]}",
+                    level=logging.ERROR,
+                    guild_id=guild_id,
+                    bot_id=bot_id,
+                    stage="ban",
+                )
+
+    def _raid_state(self, guild_id: int) -> RaidState:
+        raid = self._raids.get(guild_id)
+        if raid is None:
+            raid = RaidState()
+            self._raids[guild_id] = raid
+        return raid
+
+    async def _on_kick_done(
+        self,
+        member: discord.Member,
+        kick_error: Optional[str],
+        elapsed: float,
+        ban: Optional[Dict[str, Any]],
+    ):
+        self._metrics.observe("join.time_to_kick", elapsed)
+        if ban is None:
+            self._metrics.incr("kick_failures" if kick_error else "kicks")
+        if kick_error:
+            await self._log_console(
+                f"kick failed: {kick_error[:200]}",
+                level=logging.WARNING,
+                guild_id=member.guild.id,
+                bot_id=member.id,
+                stage="kick",
+            )
+        raid = self._raid_state(member.guild.id)
+        if raid.is_collecting(time.monotonic()):
+            raid.kicked.append((member.id, str(member), kick_error))
+            if raid.summary_task is None or raid.summary_task.done():
+                raid.summary_task = asyncio.create_task(self._raid_summary_after_quiet(member.guild))
+            return
+
+        # 임시 차단은 쿨다운과 무관하게 한 번은 알린다.
+        if ban is None and await self._cooldown_hit(member.guild.id, member.id):
             return
 
+        if ban is not None:
+            kick_result = f"반복 재입장으로 임시 차단 (해제: <t:{ban['until']}:R>)"
+        else:
+            kick_result = "킥 실패" if kick_error else "킥 성공"
         lines = [
             f"**봇:** {member}(`{member.id}`)",
             f"**서버:** {member.guild.name}(`{member.guild.id}`)",
@@ -436,33 +1718,59 @@ class BotGate(commands.Cog):
         )
         await self._send_log(member.guild, view)
 
+    async def _raid_summary_after_quiet(self, guild: discord.Guild):
+        raid = self._raid_state(guild.id)
+        queue = self._kick_queue(guild.id)
+        while True:
+            delay = raid.active_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            if queue.pending:
+                await asyncio.sleep(1)
+                continue
+            kicked, raid.kicked = raid.kicked, []
+            if not kicked:
+                return
+            self._metrics.incr("raid_summaries")
+            await self._post_raid_summary(guild, kicked)
+
+    async def _post_raid_summary(self, guild: discord.Guild, kicked: List[Tuple[int, str, Optional[str]]]):
+        failed = sum(1 for _, _, error in kicked if error)
+        pages = [kicked[i:i + RAID_PAGE_SIZE] for i in range(0, len(kicked), RAID_PAGE_SIZE)]
+        for index, page in enumerate(pages, start=1):
+            entries = []
+            for bot_id, name, error in page:
+                result = f"킥 실패: {error[:100]}" if error else "킥 성공"
+                entries.append(f"{name}(`{bot_id}`) - {result}")
+            view = RaidSummaryLayoutView(
+                self,
+                guild.id,
+                page,
+                title=f"🚨 봇 대량 입장 감지 ({index}/{len(pages)})",
+                lines=[
+                    f"**서버:** {guild.name}(`{guild.id}`)",
+                    f"**감지된 봇:** {len(kicked)}개 (킥 성공 {len(kicked) - failed} / 실패 {failed})",
+                    "\n".join(entries),
+                ],
+                footer="버튼으로 개별 승인 | 수동 승인: [p]botgate allow <bot_id>",
+            )
+            await self._send_log(guild, view)
+
     @commands.group(name="botgate")
     @commands.guild_only()
     @commands.admin_or_permissions(administrator=True)
     async def botgate(self, ctx: commands.Context):
         """BotGate 설정"""
         if ctx.invoked_subcommand is None:
-            await self._send_help_view(
-                ctx,
-                "BotGate 명령어",
-                [
-                    "`!botgate toggle` - 기능 ON/OFF",
-                    "`!botgate channel <채널>` - 로그 채널 설정",
-                    "`!botgate setrole <역할|none>` - 승인 봇 자동 역할",
-                    "`!botgate status` - 현재 설정 요약",
-                    "`!botgate allow <bot_id>` - 봇 수동 허용",
-                    "`!botgate deny <bot_id>` - 봇 수동 차단",
-                    "`!botgate approver ...` - 승인 권한자 관리",
-                ],
-            )
+            await ctx.send(view=HELP.static())
             return
 
     @botgate.command(name="toggle")
     async def botgate_toggle(self, ctx: commands.Context):
         """기능 ON/OFF"""
-        current = await self.config.guild(ctx.guild).enabled()
-        new_value = not current
-        await self.config.guild(ctx.guild).enabled.set(new_value)
+        new_value = not self._guild_settings(ctx.guild.id)["enabled"]
+        await self._set_setting(ctx.guild.id, "enabled", new_value)
         view = BotGateLayoutView(
             title="BotGate 상태 변경",
             lines=[f"BotGate가 {'ON' if new_value else 'OFF'} 상태입니다."],
@@ -474,7 +1782,7 @@ class BotGate(commands.Cog):
     @botgate.command(name="channel")
     async def botgate_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         """로그 채널 설정"""
-        await self.config.guild(ctx.guild).log_channel_id.set(channel.id)
+        await self._set_setting(ctx.guild.id, "log_channel_id", channel.id)
         view = BotGateLayoutView(
             title="로그 채널 설정",
             lines=[f"로그 채널을 {channel.mention}로 설정했습니다."],
@@ -487,13 +1795,8 @@ class BotGate(commands.Cog):
     async def botgate_setrole(self, ctx: commands.Context, *, role_arg: Optional[str] = None):
         """승인된 봇에게 자동 부여할 역할 설정/해제"""
         if role_arg is None or role_arg.lower() == "none":
-            await self.config.guild(ctx.guild).approved_role_id.set(None)
-            view = BotGateLayoutView(
-                title="자동 역할 해제",
-                lines=["자동 역할 부여를 해제했습니다."],
-                accent_color=int(discord.Color.orange()),
-                use_container=True,
-            )
+            await self._set_setting(ctx.guild.id, "approved_role_id", None)
+            view = ROLE_CLEARED.static()
             await self._send_command_view(ctx, view)
             return
 
@@ -501,16 +1804,11 @@ class BotGate(commands.Cog):
         try:
             role = await converter.convert(ctx, role_arg)
         except commands.BadArgument:
-            view = BotGateLayoutView(
-                title="역할 찾기 실패",
-                lines=["역할을 찾을 수 없습니다. 멘션 또는 역할 이름을 사용하세요."],
-                accent_color=int(discord.Color.red()),
-                use_container=True,
-            )
+            view = ROLE_NOT_FOUND.static()
             await self._send_command_view(ctx, view)
             return
 
-        await self.config.guild(ctx.guild).approved_role_id.set(role.id)
+        await self._set_setting(ctx.guild.id, "approved_role_id", role.id)
         view = BotGateLayoutView(
             title="자동 역할 설정",
             lines=[f"승인된 봇 자동 역할을 {role.mention}로 설정했습니다."],
@@ -522,15 +1820,15 @@ class BotGate(commands.Cog):
     @botgate.command(name="status")
     async def botgate_status(self, ctx: commands.Context):
         """현재 설정 요약"""
-        conf = self.config.guild(ctx.guild)
-        enabled = await conf.enabled()
-        log_channel_id = await conf.log_channel_id()
-        role_id = await conf.approved_role_id()
-        allowlist = await conf.allowlist()
-
-        owner_always = await conf.approver_owner_always()
-        approver_user_ids = await conf.approver_user_ids()
-        approver_role_ids = await conf.approver_role_ids()
+        settings = self._guild_settings(ctx.guild.id)
+        enabled = settings["enabled"]
+        log_channel_id = settings["log_channel_id"]
+        role_id = settings["approved_role_id"]
+        allowlist_count = self._allowlist.count(ctx.guild.id)
+
+        owner_always = settings["approver_owner_always"]
+        approver_user_ids = settings["approver_user_ids"]
+        approver_role_ids = settings["approver_role_ids"]
         user_mentions = " ".join(f"<@{uid}>" for uid in approver_user_ids[:10]) or "없음"
         role_mentions = " ".join(f"<@&{rid}>" for rid in approver_role_ids[:10]) or "없음"
         if len(approver_user_ids) > 10:
@@ -543,7 +1841,28 @@ class BotGate(commands.Cog):
                 f"**활성화:** {'ON' if enabled else 'OFF'}",
                 f"**로그 채널:** <#{log_channel_id}>" if log_channel_id else "**로그 채널:** 미설정",
                 f"**승인 역할:** <@&{role_id}>" if role_id else "**승인 역할:** 미설정",
-                f"**허용 목록 수:** {len(allowlist)}",
+                f"**허용 목록 수:** {allowlist_count}",
+                (
+                    f"**전역 신뢰 목록:** {'ON' if settings['use_global_trust'] else 'OFF'} "
+                    f"({len(self._trusted_bots)}개)"
+                ),
+                (
+                    f"**승인 대기:** {self._pending.count(ctx.guild.id)}개 "
+                    f"(보관 {settings['pending_ttl_hours']}시간)"
+                ),
+                (
+                    f"**레이드 감지:** {settings['raid_window_seconds']}초 내 "
+                    f"{settings['raid_threshold']}개 이상"
+                    if settings["raid_threshold"]
+                    else "**레이드 감지:** OFF"
+                ),
+                (
+                    f"**반복 재입장 차단:** {settings['rejoin_window_seconds']}초 내 "
+                    f"{settings['rejoin_ban_threshold']}회 → {settings['rejoin_ban_hours']}시간 "
+                    f"(차단 중 {self._bans.count(ctx.guild.id)}개)"
+                    if settings["rejoin_ban_threshold"]
+                    else "**반복 재입장 차단:** OFF"
+                ),
                 (
                     "**승인 버튼 권한자**\n"
                     f"소유자 항상 허용: {'ON' if owner_always else 'OFF'}\n"
@@ -557,40 +1876,565 @@ class BotGate(commands.Cog):
         await ctx.send(view=view)
 
     @botgate.command(name="allow")
-    async def botgate_allow(self, ctx: commands.Context, bot_id: int):
-        """봇 수동 허용"""
-        await self._approve_bot(ctx.guild, bot_id, approved_by=ctx.author.id, source="command")
+    async def botgate_allow(self, ctx: commands.Context, *, bot_ids: str = ""):
+        """봇 수동 허용(ID 여러 개, 또는 export 파일/CSV/텍스트 첨부로 일괄 허용)"""
+        entries = _parse_allowlist_import(bot_ids)
+        attachments = await _read_attachments(ctx)
+        if attachments:
+            for bot_id, record in _parse_allowlist_import(attachments).items():
+                entries.setdefault(bot_id, record)
+        if not entries:
+            await ctx.send_help()
+            return
+
+        if len(entries) == 1 and not attachments:
+            bot_id = next(iter(entries))
+            await self._approve_bot(ctx.guild, bot_id, approved_by=ctx.author.id, source="command")
+            view = BotGateLayoutView(
+                title="봇 허용 완료",
+                lines=[f"`{bot_id}`를 허용 목록에 추가했습니다."],
+                accent_color=int(discord.Color.green()),
+                use_container=True,
+            )
+            await self._send_command_view(ctx, view, skip_if_log_channel=True)
+            return
+
+        added = await self._approve_bots(ctx.guild, entries, approved_by=ctx.author.id, source="command")
         view = BotGateLayoutView(
-            title="봇 허용 완료",
-            lines=[f"`{bot_id}`를 허용 목록에 추가했습니다."],
-            accent_color=int(discord.Color.green()),
+            title="봇 일괄 허용",
+            lines=[
+                f"새로 허용: {len(added)}개 / 이미 허용됨: {len(entries) - len(added)}개",
+                f"허용 목록 수: {self._allowlist.count(ctx.guild.id)}",
+            ],
+            accent_color=int(discord.Color.green() if added else discord.Color.orange()),
             use_container=True,
         )
-        await self._send_command_view(ctx, view, skip_if_log_channel=True)
+        await self._send_command_view(ctx, view, skip_if_log_channel=bool(added))
 
     @botgate.command(name="deny")
-    async def botgate_deny(self, ctx: commands.Context, bot_id: int):
-        """봇 수동 차단(허용 목록 제거)"""
-        allowlist = await self.config.guild(ctx.guild).allowlist()
-        if str(bot_id) in allowlist:
-            allowlist.pop(str(bot_id), None)
-            await self.config.guild(ctx.guild).allowlist.set(allowlist)
+    async def botgate_deny(self, ctx: commands.Context, *, bot_ids: str = ""):
+        """봇 수동 차단(허용 목록 제거, ID 여러 개 또는 첨부 파일 가능)"""
+        ids = _parse_bot_ids(bot_ids + "\n" + await _read_attachments(ctx))
+        current = self._allowlist.for_guild(ctx.guild.id)
+        removed = [bot_id for bot_id in ids if bot_id in current]
+        if not removed:
+            view = NOT_IN_ALLOWLIST.static()
+            await self._send_command_view(ctx, view)
+            return
+
+        if len(removed) == 1:
+            # 저널을 거치므로 다른 프로세스에는 반영 시점에 알린다.
+            await self._allowlist.remove(ctx.guild.id, removed[0])
+            lines = [f"`{removed[0]}`를 허용 목록에서 제거했습니다."]
+        else:
+            removed_ids = set(removed)
+            await self._allowlist.replace_guild(
+                ctx.guild.id,
+                {bot_id: record for bot_id, record in current.items() if bot_id not in removed_ids},
+            )
+            lines = [
+                f"제거: {len(removed)}개 / 목록에 없음: {len(ids) - len(removed)}개",
+                f"허용 목록 수: {self._allowlist.count(ctx.guild.id)}",
+            ]
+            await self._publish_change("allowlist", ctx.guild.id)
+        view = BotGateLayoutView(
+            title="봇 차단 완료",
+            lines=lines,
+            accent_color=int(discord.Color.orange()),
+            use_container=True,
+        )
+        await self._send_command_view(ctx, view)
+
+    @botgate.command(name="list")
+    async def botgate_list(self, ctx: commands.Context, *, query: str = ""):
+        """허용 목록 보기(newest|oldest|id 정렬, @승인자, YYYY-MM-DD 이후 승인분 필터)"""
+        try:
+            parsed = parse_list_query(query)
+        except ValueError as exc:
             view = BotGateLayoutView(
-                title="봇 차단 완료",
-                lines=[f"`{bot_id}`를 허용 목록에서 제거했습니다."],
-                accent_color=int(discord.Color.orange()),
+                title="조회 조건 오류",
+                lines=[
+                    f"`{exc}`를 이해하지 못했습니다.",
+                    "정렬은 `newest`/`oldest`/`id`, 승인자는 멘션이나 ID, 날짜는 `YYYY-MM-DD`로 주세요.",
+                ],
+                accent_color=int(discord.Color.red()),
                 use_container=True,
             )
+            await ctx.send(view=view)
+            return
+        view = self._allowlist_page_view(ctx.guild, parsed, 0)
+        await ctx.send(view=view)
+        view.stop()
+
+    def _allowlist_page_view(self, guild: discord.Guild, query: ListQuery, page: int) -> BotGateLayoutView:
+        bot_ids, total, page = self._allowlist_index.page(guild.id, query, page)
+        pages = max(1, -(-total // LIST_PAGE_SIZE))
+        lines = []
+        for bot_id in bot_ids:
+            record = self._allowlist.get(guild.id, bot_id)
+            lines.append(f"`{bot_id}` · <@{record.approved_by}> · <t:{record.approved_at}:d>")
+        conditions = [f"정렬: {query.sort}"]
+        if query.approver_id:
+            conditions.append(f"승인자: <@{query.approver_id}>")
+        if query.since:
+            conditions.append(f"<t:{query.since}:d> 이후")
+        return BotGateLayoutView(
+            title=f"허용 목록 ({total}개)",
+            lines=["\n".join(lines) or "조건에 맞는 봇이 없습니다."],
+            footer=f"{' · '.join(conditions)} · {page + 1}/{pages} 페이지",
+            actions=[
+                AllowlistPageButton(guild.id, query, page - 1 if page else 0, label="이전", disabled=page == 0),
+                AllowlistPageButton(guild.id, query, page + 1, label="다음", disabled=page + 1 >= pages),
+            ],
+            accent_color=int(discord.Color.blurple()),
+            use_container=True,
+        )
+
+    @botgate.command(name="export")
+    async def botgate_export(self, ctx: commands.Context):
+        """허용 목록을 승인자/승인 시각과 함께 JSON 파일로 내보내기"""
+        entries = self._allowlist.for_guild(ctx.guild.id)
+        payload = {
+            "guild_id": str(ctx.guild.id),
+            "exported_at": discord.utils.utcnow().isoformat(),
+            "entries": [
+                {
+                    "bot_id": str(bot_id),
+                    "approved_by": entries[bot_id].approved_by,
+                    "approved_at": datetime.fromtimestamp(entries[bot_id].approved_at, timezone.utc).isoformat(),
+                }
+                for bot_id in sorted(entries)
+            ],
+        }
+        filename = f"botgate-allowlist-{ctx.guild.id}.json"
+        data = json.dumps(payload, ensure_ascii=False, indent=1).encode("utf-8")
+        view = BotGateLayoutView(
+            title="허용 목록 내보내기",
+            lines=[
+                f"**항목 수:** {len(entries)}",
+                "`!botgate allow`에 이 파일을 첨부하면 승인자/시각을 유지한 채 가져옵니다.",
+            ],
+            accent_color=int(discord.Color.blurple()),
+            use_container=True,
+        )
+        view.add_item(discord.ui.File(f"attachment://{filename}"))
+        await ctx.send(view=view, file=discord.File(io.BytesIO(data), filename=filename))
+
+    @botgate.command(name="raid")
+    async def botgate_raid(self, ctx: commands.Context, threshold: int, window: Optional[int] = None):
+        """레이드 감지 기준 설정(threshold 0이면 OFF)"""
+        if threshold < 0 or (window is not None and window <= 0):
+            view = INVALID_RAID_VALUES.static()
             await self._send_command_view(ctx, view)
             return
+        await self._set_setting(ctx.guild.id, "raid_threshold", threshold)
+        if window is not None:
+            await self._set_setting(ctx.guild.id, "raid_window_seconds", window)
+        window = self._guild_settings(ctx.guild.id)["raid_window_seconds"]
         view = BotGateLayoutView(
-            title="허용 목록 없음",
-            lines=["해당 봇은 허용 목록에 없습니다."],
-            accent_color=int(discord.Color.red()),
+            title="레이드 감지 설정",
+            lines=[
+                f"{window}초 안에 미승인 봇 {threshold}개 이상 입장 시 요약 알림으로 전환합니다."
+                if threshold
+                else "레이드 감지를 껐습니다."
+            ],
+            accent_color=int(discord.Color.green()),
+            use_container=True,
+        )
+        await self._send_command_view(ctx, view)
+
+    @botgate.command(name="rejoin")
+    async def botgate_rejoin(
+        self, ctx: commands.Context, threshold: int, window: Optional[int] = None, hours: Optional[int] = None
+    ):
+        """반복 재입장 봇 임시 차단 기준 설정(threshold 0이면 OFF)"""
+        if threshold < 0 or (window is not None and window <= 0) or (hours is not None and hours <= 0):
+            view = INVALID_REJOIN_VALUES.static()
+            await self._send_command_view(ctx, view)
+            return
+        await self._set_setting(ctx.guild.id, "rejoin_ban_threshold", threshold)
+        if window is not None:
+            await self._set_setting(ctx.guild.id, "rejoin_window_seconds", window)
+        if hours is not None:
+            await self._set_setting(ctx.guild.id, "rejoin_ban_hours", hours)
+        settings = self._guild_settings(ctx.guild.id)
+        view = BotGateLayoutView(
+            title="반복 재입장 차단 설정",
+            lines=[
+                f"같은 미승인 봇이 {settings['rejoin_window_seconds']}초 안에 {threshold}번 들어오면 "
+                f"킥 대신 {settings['rejoin_ban_hours']}시간 동안 차단합니다."
+                if threshold
+                else "반복 재입장 차단을 껐습니다."
+            ],
+            accent_color=int(discord.Color.green()),
+            use_container=True,
+        )
+        await self._send_command_view(ctx, view)
+
+    @botgate.command(name="pendingttl")
+    async def botgate_pendingttl(self, ctx: commands.Context, hours: int):
+        """승인 대기 알림 보관 시간 설정"""
+        if hours <= 0:
+            view = INVALID_PENDING_TTL.static()
+            await self._send_command_view(ctx, view)
+            return
+        await self._set_setting(ctx.guild.id, "pending_ttl_hours", hours)
+        view = BotGateLayoutView(
+            title="승인 대기 보관 시간",
+            lines=[f"승인 대기 알림을 {hours}시간 동안 추적합니다."],
+            accent_color=int(discord.Color.green()),
+            use_container=True,
+        )
+        await self._send_command_view(ctx, view)
+
+    @botgate.command(name="stats")
+    async def botgate_stats(self, ctx: commands.Context):
+        """처리 단계별 지연과 카운터(봇 전체)"""
+        counters = self._metrics.counters
+        counter_line = " | ".join(f"{name} {counters[name]}" for name in sorted(counters)) or "없음"
+        stage_lines = []
+        for stage in sorted(self._metrics.histograms):
+            histogram = self._metrics.histograms[stage]
+            p50, p99 = histogram.quantiles((0.5, 0.99))
+            stage_lines.append(
+                f"`{stage}` p50 {p50 * 1000:.1f}ms · p99 {p99 * 1000:.1f}ms · n={histogram.count}"
+            )
+        first = {path: counters[f"join_signal_first_{path}"] for path in JOIN_SIGNAL_PATHS}
+        signal_line = " · ".join(
+            f"{path} {count}회({count * 100 / max(1, sum(first.values())):.0f}%)" for path, count in first.items()
+        )
+        view = BotGateLayoutView(
+            title="BotGate 처리 통계",
+            lines=[
+                f"**카운터:** {counter_line}",
+                f"**먼저 도착한 입장 신호:** {signal_line}",
+                "**단계별 지연**\n" + ("\n".join(stage_lines) or "기록 없음"),
+            ],
+            footer=(
+                f"Prometheus 파일: {self._metrics_path}" if self._metrics_path else "Prometheus 파일: 꺼짐"
+            ),
+            accent_color=int(discord.Color.blurple()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate.command(name="sweep")
+    async def botgate_sweep(self, ctx: commands.Context, mode: Optional[str] = None):
+        """이미 들어와 있는 봇을 허용 목록과 대조해 보고(apply를 주면 실제로 킥/역할 부여)"""
+        dry_run = (mode or "").lower() != "apply"
+        if ctx.guild.id in self._sweeps:
+            view = SWEEP_IN_PROGRESS.static()
+            await ctx.send(view=view)
+            return
+        self._sweeps.add(ctx.guild.id)
+        try:
+            await self._run_sweep(ctx, dry_run)
+        finally:
+            self._sweeps.discard(ctx.guild.id)
+
+    async def _run_sweep(self, ctx: commands.Context, dry_run: bool):
+        guild = ctx.guild
+        if not guild.chunked:
+            await guild.chunk()
+        members = list(guild.members)
+        self_id = self.bot.user.id if self.bot.user else None
+        role_id = self._guild_settings(guild.id)["approved_role_id"]
+        counts = {"scanned": 0, "bots": 0, "kicked": 0, "kick_failed": 0, "roles": 0}
+        to_kick: List[discord.Member] = []
+        to_role: List[discord.Member] = []
+
+        progress = await ctx.send(view=self._sweep_view(counts, len(members), to_kick, to_role, dry_run))
+        last_update = time.monotonic()
+
+        async def report(done: bool = False):
+            nonlocal last_update
+            if not done and time.monotonic() - last_update < SWEEP_PROGRESS_INTERVAL:
+                return
+            last_update = time.monotonic()
+            view = self._sweep_view(counts, len(members), to_kick, to_role, dry_run, done=done)
+            try:
+                await progress.edit(view=view)
+            except discord.HTTPException:
+                pass
+
+        # 1단계: 청크 단위로 멤버를 훑으며 대상만 고른다. 청크마다 이벤트 루프에 양보한다.
+        for start in range(0, len(members), SWEEP_CHUNK_SIZE):
+            for member in members[start:start + SWEEP_CHUNK_SIZE]:
+                if not member.bot or member.id == self_id:
+                    continue
+                counts["bots"] += 1
+                if self._is_allowed(guild, member.id):
+                    if role_id and member.get_role(role_id) is None:
+                        to_role.append(member)
+                else:
+                    to_kick.append(member)
+            counts["scanned"] = min(len(members), start + SWEEP_CHUNK_SIZE)
+            await asyncio.sleep(0)
+            await report()
+
+        # 2단계: REST 호출은 하나씩, 간격을 두고 보낸다.
+        if not dry_run:
+            for member in to_kick:
+                try:
+                    await self._kick_member(member)
+                    counts["kicked"] += 1
+                except Exception:
+                    counts["kick_failed"] += 1
+                await asyncio.sleep(SWEEP_ACTION_INTERVAL)
+                await report()
+            for member in to_role:
+                if await self._assign_role_if_needed(member):
+                    counts["roles"] += 1
+                await asyncio.sleep(SWEEP_ACTION_INTERVAL)
+                await report()
+        await report(done=True)
+
+    def _sweep_view(
+        self,
+        counts: Dict[str, int],
+        total: int,
+        to_kick: List[discord.Member],
+        to_role: List[discord.Member],
+        dry_run: bool,
+        *,
+        done: bool = False,
+    ) -> BotGateLayoutView:
+        lines = [
+            f"**확인한 멤버:** {counts['scanned']}/{total}",
+            f"**봇:** {counts['bots']}개",
+            f"**미승인 봇:** {len(to_kick)}개",
+            f"**역할 누락 승인 봇:** {len(to_role)}개",
+        ]
+        if not dry_run:
+            lines.append(
+                f"**처리:** 킥 {counts['kicked']} / 킥 실패 {counts['kick_failed']} / 역할 부여 {counts['roles']}"
+            )
+        if done and to_kick:
+            preview = ", ".join(f"`{member.id}`" for member in to_kick[:20])
+            if len(to_kick) > 20:
+                preview += f" 외 {len(to_kick) - 20}개"
+            lines.append(f"**미승인 봇 목록:** {preview}")
+        title = "봇 점검 완료" if done else "봇 점검 중..."
+        if dry_run:
+            title += " (dry run)"
+        return BotGateLayoutView(
+            title=title,
+            lines=lines,
+            footer="dry run: 변경 없이 결과만 보고합니다. 실제로 처리하려면 [p]botgate sweep apply" if dry_run else None,
+            accent_color=int(discord.Color.green() if done else discord.Color.blurple()),
+            use_container=True,
+        )
+
+    @botgate.command(name="announce")
+    @commands.is_owner()
+    async def botgate_announce(self, ctx: commands.Context, *, message: str):
+        """로그 채널이 설정된 모든 서버에 공지 전송(봇 소유자 전용)"""
+        announcement = ANNOUNCEMENT.render([message[:3900]])
+        result = await self._broadcast_view(lambda: announcement)
+        lines = [f"**성공:** {len(result.succeeded)}개 서버", f"**실패:** {len(result.failed)}개 서버"]
+        if result.failed:
+            failures = [f"`{guild_id}`: {reason[:100]}" for guild_id, reason in list(result.failed.items())[:10]]
+            if len(result.failed) > 10:
+                failures.append(f"외 {len(result.failed) - 10}개")
+            lines.append("\n".join(failures))
+        view = BotGateLayoutView(
+            title="공지 전송 결과",
+            lines=lines,
+            accent_color=int(discord.Color.green() if not result.failed else discord.Color.orange()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate.command(name="metricsfile")
+    @commands.is_owner()
+    async def botgate_metricsfile(self, ctx: commands.Context, *, path: str):
+        """Prometheus 텍스트 형식 통계 파일 경로 설정(봇 소유자 전용, none이면 끔)"""
+        new_path = None if path.lower() == "none" else path
+        if new_path:
+            try:
+                await self._export_metrics(new_path)
+            except OSError as exc:
+                view = BotGateLayoutView(
+                    title="파일 쓰기 실패",
+                    lines=[f"`{new_path}`에 쓸 수 없습니다: {exc}"],
+                    accent_color=int(discord.Color.red()),
+                    use_container=True,
+                )
+                await ctx.send(view=view)
+                return
+        await self.config.metrics_path.set(new_path)
+        self._metrics_path = new_path
+        view = BotGateLayoutView(
+            title="통계 파일 설정",
+            lines=[
+                f"`{new_path}`에 {METRICS_EXPORT_INTERVAL}초마다 통계를 기록합니다."
+                if new_path
+                else "통계 파일 기록을 껐습니다."
+            ],
+            accent_color=int(discord.Color.green()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate.command(name="sharedstate")
+    @commands.is_owner()
+    async def botgate_sharedstate(self, ctx: commands.Context, value: bool):
+        """샤드 프로세스 간 쿨다운/캐시 무효화 공유(SQLite WAL) 설정(봇 소유자 전용)"""
+        await self.config.shared_state.set(value)
+        if value and self._shared is None:
+            await self._start_shared_state()
+        elif not value:
+            await self._stop_shared_state()
+        if value and self._shared is None:
+            view = BotGateLayoutView(
+                title="공유 상태 열기 실패",
+                lines=["공유 상태 파일을 열지 못했습니다. 콘솔 로그를 확인하세요."],
+                accent_color=int(discord.Color.red()),
+                use_container=True,
+            )
+        else:
+            view = BotGateLayoutView(
+                title="공유 상태",
+                lines=[
+                    f"`{self._shared.path}`로 쿨다운과 설정 변경을 다른 프로세스와 공유합니다."
+                    if self._shared
+                    else "공유 상태를 껐습니다. 쿨다운과 캐시는 이 프로세스 안에서만 유지됩니다."
+                ],
+                accent_color=int(discord.Color.green()),
+                use_container=True,
+            )
+        await ctx.send(view=view)
+
+    @botgate.command(name="trace")
+    @commands.is_owner()
+    async def botgate_trace(self, ctx: commands.Context, action: str):
+        """재생용 이벤트 기록 시작/중지(start|stop, 봇 소유자 전용)"""
+        action = action.lower()
+        if action == "start" and self._trace is None:
+            stamp = discord.utils.utcnow().strftime("%Y%m%d-%H%M%S")
+            trace = TraceRecorder(str(cog_data_path(self) / TRACE_DIR / f"trace-{stamp}.jsonl"))
+            guilds = {
+                guild_id: {
+                    "enabled": settings["enabled"],
+                    "raid_threshold": settings["raid_threshold"],
+                    "raid_window_seconds": settings["raid_window_seconds"],
+                    "use_global_trust": settings["use_global_trust"],
+                    "allow": list(self._allowlist.for_guild(guild_id)),
+                }
+                for guild_id, settings in self._settings.items()
+            }
+            # 파일을 여는 동안 들어온 이벤트도 헤더 뒤에 순서대로 쌓이므로 먼저 걸어 둔다.
+            self._trace = trace
+            try:
+                await trace.start(guilds, self._trusted_bots)
+            except Exception:
+                self._trace = None
+                raise
+            lines = [f"`{trace.path}`에 기록합니다. ID는 익명화되어 저장됩니다."]
+        elif action == "stop" and self._trace is not None:
+            trace, self._trace = self._trace, None
+            await trace.close()
+            lines = [f"기록을 멈췄습니다. 이벤트 {trace.events}개: `{trace.path}`"]
+        else:
+            lines = [
+                "이미 기록 중입니다." if self._trace is not None else "기록 중이 아닙니다.",
+                "`start` 또는 `stop`을 주세요.",
+            ]
+        view = BotGateLayoutView(
+            title="이벤트 기록",
+            lines=lines,
+            accent_color=int(discord.Color.blurple()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate.command(name="globaltrust")
+    async def botgate_globaltrust(self, ctx: commands.Context, value: bool):
+        """이 서버에서 전역 신뢰 목록을 사용할지 설정"""
+        await self._set_setting(ctx.guild.id, "use_global_trust", value)
+        view = BotGateLayoutView(
+            title="전역 신뢰 목록",
+            lines=[
+                "전역 신뢰 목록의 봇을 이 서버에서도 허용합니다."
+                if value
+                else "이 서버는 전역 신뢰 목록을 쓰지 않고 서버 허용 목록만 확인합니다."
+            ],
+            accent_color=int(discord.Color.green() if value else discord.Color.orange()),
             use_container=True,
         )
         await self._send_command_view(ctx, view)
 
+    @botgate.group(name="trust")
+    @commands.is_owner()
+    async def botgate_trust(self, ctx: commands.Context):
+        """전역 신뢰 봇 목록 관리(봇 소유자 전용)"""
+        if ctx.invoked_subcommand is None:
+            await ctx.send(view=TRUST_HELP.static())
+
+    @botgate_trust.command(name="add")
+    async def botgate_trust_add(self, ctx: commands.Context, *, bot_ids: str = ""):
+        """전역 신뢰 목록에 봇 추가(ID 여러 개 또는 첨부 파일)"""
+        ids = _parse_bot_ids(bot_ids + "\n" + await _read_attachments(ctx))
+        now = discord.utils.utcnow().isoformat()
+        added = [bot_id for bot_id in ids if bot_id not in self._trusted_bots]
+        if added:
+            trusted = dict(self._trusted_bots)
+            for bot_id in added:
+                trusted[bot_id] = {"added_by": ctx.author.id, "added_at": now}
+            await self._set_trusted_bots(trusted)
+        view = BotGateLayoutView(
+            title="전역 신뢰 목록 추가",
+            lines=[
+                f"새로 추가: {len(added)}개 / 이미 등록: {len(ids) - len(added)}개",
+                f"전체: {len(self._trusted_bots)}개",
+            ],
+            accent_color=int(discord.Color.green() if added else discord.Color.orange()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate_trust.command(name="remove")
+    async def botgate_trust_remove(self, ctx: commands.Context, *, bot_ids: str = ""):
+        """전역 신뢰 목록에서 봇 제거(ID 여러 개 또는 첨부 파일)"""
+        ids = _parse_bot_ids(bot_ids + "\n" + await _read_attachments(ctx))
+        removed = [bot_id for bot_id in ids if bot_id in self._trusted_bots]
+        if removed:
+            trusted = dict(self._trusted_bots)
+            for bot_id in removed:
+                del trusted[bot_id]
+            await self._set_trusted_bots(trusted)
+        view = BotGateLayoutView(
+            title="전역 신뢰 목록 제거",
+            lines=[
+                f"제거: {len(removed)}개 / 목록에 없음: {len(ids) - len(removed)}개",
+                f"전체: {len(self._trusted_bots)}개",
+            ],
+            accent_color=int(discord.Color.green() if removed else discord.Color.orange()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    @botgate_trust.command(name="list")
+    async def botgate_trust_list(self, ctx: commands.Context):
+        """전역 신뢰 목록 조회"""
+        ids = sorted(self._trusted_bots)
+        preview = " ".join(f"`{bot_id}`" for bot_id in ids[:30]) or "없음"
+        if len(ids) > 30:
+            preview += f" 외 {len(ids) - 30}개"
+        view = BotGateLayoutView(
+            title="전역 신뢰 목록",
+            lines=[f"**전체:** {len(ids)}개", preview],
+            accent_color=int(discord.Color.blurple()),
+            use_container=True,
+        )
+        await ctx.send(view=view)
+
+    async def _set_trusted_bots(self, trusted: Dict[int, Dict[str, Any]]):
+        # 대량 추가/제거도 Config 쓰기 한 번으로 끝낸다.
+        await self.config.trusted_bots.set({str(bot_id): record for bot_id, record in trusted.items()})
+        self._trusted_bots = trusted
+        await self._publish_change("trusted")
+
     async def _ensure_owner_only(self, ctx: commands.Context) -> bool:
         if not ctx.guild:
             return False
@@ -603,30 +2447,13 @@ class BotGate(commands.Cog):
     async def botgate_approver(self, ctx: commands.Context):
         """승인 버튼 권한자 관리(서버 소유자 전용)"""
         if ctx.invoked_subcommand is None:
-            await self._send_help_view(
-                ctx,
-                "BotGate 승인 권한자 명령어",
-                [
-                    "`!botgate approver adduser @user` - 승인 권한 유저 추가",
-                    "`!botgate approver deluser @user` - 승인 권한 유저 삭제",
-                    "`!botgate approver addrole @role` - 승인 권한 역할 추가",
-                    "`!botgate approver delrole @role` - 승인 권한 역할 삭제",
-                    "`!botgate approver list` - 승인 권한자 목록",
-                    "`!botgate approver reset` - 승인 권한자 초기화",
-                    "`!botgate approver owneralways true|false` - 소유자 항상 허용",
-                ],
-            )
+            await ctx.send(view=APPROVER_HELP.static())
             return
 
     async def _owner_only_or_reply(self, ctx: commands.Context) -> bool:
         if await self._ensure_owner_only(ctx):
             return True
-        view = BotGateLayoutView(
-            title="권한 부족",
-            lines=["이 명령어는 서버 소유자만 사용할 수 있습니다."],
-            accent_color=int(discord.Color.red()),
-            use_container=True,
-        )
+        view = OWNER_ONLY.static()
         await ctx.send(view=view)
         return False
 
@@ -635,8 +2462,7 @@ class BotGate(commands.Cog):
         """승인 버튼 권한 유저 추가"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        user_ids = await conf.approver_user_ids()
+        user_ids = list(self._guild_settings(ctx.guild.id)["approver_user_ids"])
         if user.id in user_ids:
             view = BotGateLayoutView(
                 title="이미 등록됨",
@@ -647,7 +2473,7 @@ class BotGate(commands.Cog):
             await ctx.send(view=view)
             return
         user_ids.append(user.id)
-        await conf.approver_user_ids.set(user_ids)
+        await self._set_setting(ctx.guild.id, "approver_user_ids", user_ids)
         view = BotGateLayoutView(
             title="승인 권한자 추가",
             lines=[f"{user.mention}를 승인 권한자로 추가했습니다."],
@@ -661,8 +2487,7 @@ class BotGate(commands.Cog):
         """승인 버튼 권한 유저 삭제"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        user_ids = await conf.approver_user_ids()
+        user_ids = list(self._guild_settings(ctx.guild.id)["approver_user_ids"])
         if user.id not in user_ids:
             view = BotGateLayoutView(
                 title="미등록",
@@ -673,7 +2498,7 @@ class BotGate(commands.Cog):
             await ctx.send(view=view)
             return
         user_ids.remove(user.id)
-        await conf.approver_user_ids.set(user_ids)
+        await self._set_setting(ctx.guild.id, "approver_user_ids", user_ids)
         view = BotGateLayoutView(
             title="승인 권한자 삭제",
             lines=[f"{user.mention}를 승인 권한자에서 제거했습니다."],
@@ -687,8 +2512,7 @@ class BotGate(commands.Cog):
         """승인 버튼 권한 역할 추가"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        role_ids = await conf.approver_role_ids()
+        role_ids = list(self._guild_settings(ctx.guild.id)["approver_role_ids"])
         if role.id in role_ids:
             view = BotGateLayoutView(
                 title="이미 등록됨",
@@ -699,7 +2523,7 @@ class BotGate(commands.Cog):
             await ctx.send(view=view)
             return
         role_ids.append(role.id)
-        await conf.approver_role_ids.set(role_ids)
+        await self._set_setting(ctx.guild.id, "approver_role_ids", role_ids)
         view = BotGateLayoutView(
             title="승인 권한 역할 추가",
             lines=[f"{role.mention}을 승인 권한 역할로 추가했습니다."],
@@ -713,8 +2537,7 @@ class BotGate(commands.Cog):
         """승인 버튼 권한 역할 삭제"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        role_ids = await conf.approver_role_ids()
+        role_ids = list(self._guild_settings(ctx.guild.id)["approver_role_ids"])
         if role.id not in role_ids:
             view = BotGateLayoutView(
                 title="미등록",
@@ -725,7 +2548,7 @@ class BotGate(commands.Cog):
             await ctx.send(view=view)
             return
         role_ids.remove(role.id)
-        await conf.approver_role_ids.set(role_ids)
+        await self._set_setting(ctx.guild.id, "approver_role_ids", role_ids)
         view = BotGateLayoutView(
             title="승인 권한 역할 삭제",
             lines=[f"{role.mention}을 승인 권한 역할에서 제거했습니다."],
@@ -739,10 +2562,10 @@ class BotGate(commands.Cog):
         """승인 버튼 권한 목록"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        owner_always = await conf.approver_owner_always()
-        user_ids = await conf.approver_user_ids()
-        role_ids = await conf.approver_role_ids()
+        settings = self._guild_settings(ctx.guild.id)
+        owner_always = settings["approver_owner_always"]
+        user_ids = settings["approver_user_ids"]
+        role_ids = settings["approver_role_ids"]
         user_mentions = " ".join(f"<@{uid}>" for uid in user_ids[:15]) or "없음"
         role_mentions = " ".join(f"<@&{rid}>" for rid in role_ids[:15]) or "없음"
         if len(user_ids) > 15:
@@ -766,16 +2589,10 @@ class BotGate(commands.Cog):
         """승인 버튼 권한자 초기화"""
         if not await self._owner_only_or_reply(ctx):
             return
-        conf = self.config.guild(ctx.guild)
-        await conf.approver_user_ids.set([])
-        await conf.approver_role_ids.set([])
-        await conf.approver_owner_always.set(True)
-        view = BotGateLayoutView(
-            title="초기화 완료",
-            lines=["승인 권한자를 모두 초기화했습니다. (소유자 항상 허용: ON)"],
-            accent_color=int(discord.Color.green()),
-            use_container=True,
-        )
+        await self._set_setting(ctx.guild.id, "approver_user_ids", [])
+        await self._set_setting(ctx.guild.id, "approver_role_ids", [])
+        await self._set_setting(ctx.guild.id, "approver_owner_always", True)
+        view = APPROVERS_RESET.static()
         await ctx.send(view=view)
 
     @botgate_approver.command(name="owneralways")
@@ -783,7 +2600,7 @@ class BotGate(commands.Cog):
         """소유자 항상 허용 설정"""
         if not await self._owner_only_or_reply(ctx):
             return
-        await self.config.guild(ctx.guild).approver_owner_always.set(value)
+        await self._set_setting(ctx.guild.id, "approver_owner_always", value)
         view = BotGateLayoutView(
             title="설정 변경",
             lines=[f"소유자 항상 허용: {'ON' if value else 'OFF'}"],
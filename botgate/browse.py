@@ -0,0 +1,112 @@
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Tuple
+
+from .storage import AllowlistStore
+
+LIST_PAGE_SIZE = 15
+LIST_SORTS = ("newest", "oldest", "id")
+# 필터 조합별 결과 캐시 개수. 넘치면 가장 오래 안 쓴 조합부터 버린다.
+LIST_VIEW_CACHE_SIZE = 64
+
+_MENTION = re.compile(r"^<@!?([0-9]+)>$")
+_DATE = re.compile(r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$")
+
+
+class ListQuery(NamedTuple):
+    """허용 목록 브라우저 조회 조건. approver_id/since가 0이면 조건 없음"""
+
+    sort: str = "newest"
+    approver_id: int = 0
+    # epoch 초
+    since: int = 0
+
+
+def parse_list_query(text: str) -> ListQuery:
+    """``newest|oldest|id``, ``@승인자``(또는 ID), ``YYYY-MM-DD``(이후 승인분)를 순서 없이 받는다."""
+    sort, approver_id, since = "newest", 0, 0
+    for token in text.split():
+        mention = _MENTION.match(token)
+        if token.lower() in LIST_SORTS:
+            sort = token.lower()
+        elif mention or token.isdigit():
+            approver_id = int(mention.group(1) if mention else token)
+        elif _DATE.match(token):
+            since = int(datetime.strptime(token, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+        else:
+            raise ValueError(token)
+    return ListQuery(sort, approver_id, since)
+
+
+class AllowlistIndex:
+    """허용 목록 브라우저용 정렬 인덱스
+
+    길드별로 승인 시각순 ``(approved_at, bot_id)``과 ID순 목록을 한 번 정렬해 두고,
+    저장소 버전이 바뀔 때만 다시 만든다. 조건에 맞는 봇 ID 목록도 조건별로 캐시하므로
+    페이지를 넘길 때는 슬라이스만 한다. 날짜 조건은 시각순 목록에서 bisect로 자른다.
+    """
+
+    def __init__(self, store: AllowlistStore):
+        self._store = store
+        self._by_date: Dict[int, Tuple[int, List[Tuple[int, int]]]] = {}
+        self._by_id: Dict[int, Tuple[int, List[int]]] = {}
+        self._views: "OrderedDict[Tuple[int, ListQuery], Tuple[int, List[int]]]" = OrderedDict()
+
+    def page(self, guild_id: int, query: ListQuery, page: int) -> Tuple[List[int], int, int]:
+        """(이번 페이지 봇 ID, 전체 일치 수, 실제 페이지 번호)"""
+        matches = self._matching(guild_id, query)
+        pages = max(1, -(-len(matches) // LIST_PAGE_SIZE))
+        page = min(max(page, 0), pages - 1)
+        start = page * LIST_PAGE_SIZE
+        return matches[start:start + LIST_PAGE_SIZE], len(matches), page
+
+    def _matching(self, guild_id: int, query: ListQuery) -> List[int]:
+        version = self._store.version(guild_id)
+        key = (guild_id, query)
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == version:
+            self._views.move_to_end(key)
+            return cached[1]
+
+        entries = self._store.for_guild(guild_id)
+        if query.sort == "id":
+            ids = self._sorted_ids(guild_id, version)
+            matches = [
+                bot_id
+                for bot_id in ids
+                if (not query.approver_id or entries[bot_id].approved_by == query.approver_id)
+                and entries[bot_id].approved_at >= query.since
+            ]
+        else:
+            keys = self._sorted_by_date(guild_id, version)
+            window = keys[bisect_left(keys, (query.since, 0)):] if query.since else keys
+            if query.sort == "newest":
+                window = window[::-1]
+            matches = [
+                bot_id
+                for _, bot_id in window
+                if not query.approver_id or entries[bot_id].approved_by == query.approver_id
+            ]
+
+        self._views[key] = (version, matches)
+        self._views.move_to_end(key)
+        while len(self._views) > LIST_VIEW_CACHE_SIZE:
+            self._views.popitem(last=False)
+        return matches
+
+    def _sorted_by_date(self, guild_id: int, version: int) -> List[Tuple[int, int]]:
+        cached = self._by_date.get(guild_id)
+        if cached is None or cached[0] != version:
+            entries = self._store.for_guild(guild_id)
+            cached = (version, sorted((record.approved_at, bot_id) for bot_id, record in entries.items()))
+            self._by_date[guild_id] = cached
+        return cached[1]
+
+    def _sorted_ids(self, guild_id: int, version: int) -> List[int]:
+        cached = self._by_id.get(guild_id)
+        if cached is None or cached[0] != version:
+            cached = (version, sorted(self._store.for_guild(guild_id)))
+            self._by_id[guild_id] = cached
+        return cached[1]
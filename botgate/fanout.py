@@ -0,0 +1,60 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+FANOUT_CONCURRENCY = 8
+# Discord 전역 REST 제한(초당 50회)보다 여유를 둔다.
+GLOBAL_REQUESTS_PER_SECOND = 40
+
+T = TypeVar("T")
+
+
+class RatePacer:
+    """호출 시작 시각을 ``1 / rate`` 초 간격으로 배정해 초당 호출 수를 제한한다."""
+
+    def __init__(self, rate: float = GLOBAL_REQUESTS_PER_SECOND):
+        self._interval = 1.0 / rate
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        start = max(now, self._next)
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class FanOutResult:
+    def __init__(self):
+        self.succeeded: List[int] = []
+        self.failed: Dict[int, str] = {}
+
+    @property
+    def total(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+
+async def fan_out(
+    targets: Iterable[Tuple[int, T]],
+    send: Callable[[T], Awaitable[object]],
+    *,
+    concurrency: int = FANOUT_CONCURRENCY,
+    pacer: Optional[RatePacer] = None,
+) -> FanOutResult:
+    """``(guild_id, target)`` 목록에 ``send``를 동시 ``concurrency``개까지 실행하고 길드별 결과를 모은다."""
+    pacer = pacer or RatePacer()
+    semaphore = asyncio.Semaphore(concurrency)
+    result = FanOutResult()
+
+    async def run(guild_id: int, target: T) -> None:
+        async with semaphore:
+            await pacer.wait()
+            try:
+                await send(target)
+            except Exception as exc:
+                result.failed[guild_id] = str(exc) or type(exc).__name__
+            else:
+                result.succeeded.append(guild_id)
+
+    await asyncio.gather(*(run(guild_id, target) for guild_id, target in targets))
+    return result
@@ -0,0 +1,96 @@
+import logging
+import logging.handlers
+import queue
+import time
+from typing import Any, Dict, Optional, Tuple
+
+LOGGER_NAME = "red.botgate"
+REPEAT_WINDOW_SECONDS = 60.0
+
+
+class ConsoleLog:
+    """이벤트 루프를 막지 않는 구조화 로거
+
+    레코드는 QueueHandler로 큐에 넣고, 실제 출력은 QueueListener 스레드가 맡는다. 리스너는
+    전파가 했을 일을 그대로 대신해 상위 로거("red", 루트)의 핸들러로 보내므로 Red의 파일/Rich
+    로그와 각 핸들러의 포매터는 그대로 쓰인다. 같은 (레벨, 메시지, guild_id, stage) 조합은
+    ``repeat_window`` 초에 한 번만 출력하고, 그 사이 생략한 횟수를 다음 출력에 붙인다.
+    """
+
+    def __init__(self, name: str = LOGGER_NAME, *, repeat_window: float = REPEAT_WINDOW_SECONDS):
+        self.logger = logging.getLogger(name)
+        self._repeat_window = repeat_window
+        self._recent: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self._handler = logging.handlers.QueueHandler(self._queue)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._propagate = self.logger.propagate
+
+    def start(self) -> None:
+        if self._listener is not None:
+            return
+        if self._propagate and self.logger.parent is not None:
+            targets = [_Propagate(self.logger.parent)]
+        else:
+            targets = []
+        self._listener = logging.handlers.QueueListener(self._queue, *targets)
+        self._listener.start()
+        self.logger.addHandler(self._handler)
+        # 상위 전달은 리스너 스레드의 _Propagate가 한다. 루프에서 한 번 더 보내지 않게 끊는다.
+        self.logger.propagate = False
+
+    def stop(self) -> None:
+        if self._listener is None:
+            return
+        self.logger.removeHandler(self._handler)
+        self.logger.propagate = self._propagate
+        self._listener.stop()
+        self._listener = None
+
+    def log(
+        self,
+        level: int,
+        message: str,
+        *,
+        guild_id: Optional[int] = None,
+        bot_id: Optional[int] = None,
+        stage: Optional[str] = None,
+    ) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        fields = {"guild_id": guild_id, "bot_id": bot_id, "stage": stage}
+        key = (level, message, guild_id, stage)
+        now = time.monotonic()
+        last = self._recent.get(key)
+        if last is not None and now - last[0] < self._repeat_window:
+            self._recent[key] = (last[0], last[1] + 1)
+            return
+        suppressed = last[1] if last is not None else 0
+        self._recent[key] = (now, 0)
+        if len(self._recent) > 1024:
+            self._prune(now)
+
+        suffix = " ".join(f"{name}={value}" for name, value in fields.items() if value is not None)
+        text = f"{message} {suffix}" if suffix else message
+        if suppressed:
+            text += f" (이전 {self._repeat_window:.0f}초 동안 {suppressed}회 반복)"
+        self.logger.log(level, text, extra=fields)
+
+    def _prune(self, now: float) -> None:
+        self._recent = {
+            key: value
+            for key, value in self._recent.items()
+            if now - value[0] < self._repeat_window or value[1]
+        }
+
+
+class _Propagate(logging.Handler):
+    """레코드를 ``parent``부터 위로 전파하듯 상위 로거 핸들러에 넘긴다(리스너 스레드에서 호출)."""
+
+    def __init__(self, parent: logging.Logger):
+        super().__init__()
+        self.parent = parent
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # 전파와 같게 상위 로거의 필터는 거치지 않고 핸들러 레벨/필터만 적용된다.
+        self.parent.callHandlers(record)
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+import discord
+
+LOG_BATCH_WINDOW = 1.0
+LOG_QUEUE_SIZE = 100
+LOG_CLOSE_TIMEOUT = 10.0
+
+FlushCallback = Callable[[int, List[discord.ui.LayoutView], int], Awaitable[None]]
+
+
+class LogDispatcher:
+    """길드별 로그 전송 대기열
+
+    ``submit``은 대기열에 넣기만 하고 바로 반환한다. 길드마다 워커가 ``window`` 초 동안
+    들어온 로그를 모아 ``flush(guild_id, views, dropped)``로 넘긴다. 대기열이 가득 차면
+    새 로그는 버리고 개수만 세어 다음 flush에 함께 전달한다.
+    """
+
+    def __init__(
+        self,
+        flush: FlushCallback,
+        *,
+        window: float = LOG_BATCH_WINDOW,
+        maxsize: int = LOG_QUEUE_SIZE,
+    ):
+        self._flush = flush
+        self._window = window
+        self._maxsize = maxsize
+        self._queues: Dict[int, "asyncio.Queue[discord.ui.LayoutView]"] = {}
+        self._dropped: Dict[int, int] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._closing = asyncio.Event()
+
+    def submit(self, guild_id: int, view: discord.ui.LayoutView) -> bool:
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self._maxsize)
+            self._queues[guild_id] = queue
+        accepted = True
+        try:
+            queue.put_nowait(view)
+        except asyncio.QueueFull:
+            self._dropped[guild_id] = self._dropped.get(guild_id, 0) + 1
+            accepted = False
+        task = self._tasks.get(guild_id)
+        if task is None or task.done():
+            self._tasks[guild_id] = asyncio.create_task(self._drain(guild_id))
+        return accepted
+
+    @property
+    def idle(self) -> bool:
+        return all(task.done() for task in self._tasks.values())
+
+    async def close(self) -> None:
+        self._closing.set()
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            _, still_running = await asyncio.wait(tasks, timeout=LOG_CLOSE_TIMEOUT)
+            for task in still_running:
+                task.cancel()
+        self._tasks.clear()
+
+    async def _drain(self, guild_id: int) -> None:
+        queue = self._queues[guild_id]
+        while not queue.empty() or self._dropped.get(guild_id):
+            if not self._closing.is_set():
+                try:
+                    await asyncio.wait_for(self._closing.wait(), timeout=self._window)
+                except asyncio.TimeoutError:
+                    pass
+            batch = []
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            dropped = self._dropped.pop(guild_id, 0)
+            try:
+                await self._flush(guild_id, batch, dropped)
+            except Exception:
+                continue
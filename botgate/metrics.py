@@ -0,0 +1,70 @@
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List
+
+HISTOGRAM_SIZE = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class RollingHistogram:
+    """최근 ``size``개 샘플(초)만 보관하는 지연 히스토그램. 누적 개수/합계는 따로 센다."""
+
+    def __init__(self, size: int = HISTOGRAM_SIZE):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self, qs=QUANTILES) -> List[float]:
+        if not self._samples:
+            return [0.0 for _ in qs]
+        ordered = sorted(self._samples)
+        last = len(ordered) - 1
+        return [ordered[min(last, int(q * len(ordered)))] for q in qs]
+
+
+class Metrics:
+    """단계별 지연 히스토그램과 이벤트 카운터"""
+
+    def __init__(self):
+        self.counters: Counter = Counter()
+        self.histograms: Dict[str, RollingHistogram] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, stage: str, seconds: float) -> None:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = RollingHistogram()
+            self.histograms[stage] = histogram
+        histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for name in sorted(self.counters):
+            metric = f"botgate_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {self.counters[name]}")
+        if self.histograms:
+            lines.append("# TYPE botgate_stage_seconds summary")
+        for stage in sorted(self.histograms):
+            histogram = self.histograms[stage]
+            for q, value in zip(QUANTILES, histogram.quantiles()):
+                lines.append(f'botgate_stage_seconds{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'botgate_stage_seconds_sum{{stage="{stage}"}} {histogram.total:.6f}')
+            lines.append(f'botgate_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Set, Tuple
+
+import discord
+
+# 킥 라우트 버킷은 길드 단위이므로 길드당 동시 요청 수를 작게 유지한다.
+KICK_WORKERS = 3
+# 길드당 재입장 횟수를 추적하는 봇 수. 넘치면 가장 오래 안 들어온 봇부터 잊는다.
+REJOIN_TRACK_LIMIT = 1024
+
+# 돌려준 값은 on_done에 그대로 넘긴다(예: 킥 대신 차단했으면 차단 기록).
+KickCallback = Callable[[discord.Member], Awaitable[Any]]
+# (member, 실패 사유, 대기열 투입부터 킥 완료까지 걸린 초, 킥 콜백이 돌려준 값)
+KickDoneCallback = Callable[[discord.Member, Optional[str], float, Any], Awaitable[None]]
+
+
+class KickQueue:
+    """길드 하나의 킥 대기열
+
+    같은 봇은 대기 중인 동안 한 번만 들어가고, 최대 ``workers``개의 워커가
+    차례로 킥한다. 워커는 대기열이 비면 스스로 종료된다.
+    """
+
+    def __init__(self, kick: KickCallback, on_done: KickDoneCallback, *, workers: int = KICK_WORKERS):
+        self._queue: "asyncio.Queue[Tuple[discord.Member, float]]" = asyncio.Queue()
+        self._queued: Set[int] = set()
+        self._workers: List[asyncio.Task] = []
+        self._max_workers = workers
+        self._kick = kick
+        self._on_done = on_done
+
+    @property
+    def pending(self) -> int:
+        return len(self._queued)
+
+    @property
+    def idle(self) -> bool:
+        """대기 중인 킥도, 킥 후처리(on_done) 중인 워커도 없으면 True"""
+        return not self._queued and all(task.done() for task in self._workers)
+
+    def enqueue(self, member: discord.Member) -> bool:
+        if member.id in self._queued:
+            return False
+        self._queued.add(member.id)
+        self._queue.put_nowait((member, time.perf_counter()))
+        self._workers = [task for task in self._workers if not task.done()]
+        if len(self._workers) < self._max_workers:
+            self._workers.append(asyncio.create_task(self._worker()))
+        return True
+
+    async def drain(self, timeout: float) -> None:
+        """대기 중인 킥이 끝날 때까지 최대 ``timeout``초 기다린 뒤 남은 워커를 멈춘다."""
+        workers = [task for task in self._workers if not task.done()]
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
+        self.close()
+
+    def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        self._workers.clear()
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                member, enqueued_at = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            error = None
+            result = None
+            try:
+                result = await self._kick(member)
+            except Exception as exc:
+                error = str(exc)
+            finally:
+                self._queued.discard(member.id)
+            try:
+                await self._on_done(member, error, time.perf_counter() - enqueued_at, result)
+            except Exception:
+                continue
+
+
+class RaidState:
+    """길드 하나의 봇 입장 버스트 감지 상태
+
+    ``window`` 초 안에 ``threshold``개 이상의 미승인 봇이 들어오면 레이드로 보고,
+    마지막 입장 후 ``window`` 초가 지날 때까지 개별 알림 대신 ``kicked``에 모은다.
+    """
+
+    def __init__(self):
+        self._joins: Deque[float] = deque()
+        self.active_until = 0.0
+        self.kicked: List[Tuple[int, str, Optional[str]]] = []
+        self.summary_task: Optional[asyncio.Task] = None
+
+    def record_join(self, now: float, threshold: int, window: float) -> bool:
+        joins = self._joins
+        joins.append(now)
+        while joins and now - joins[0] > window:
+            joins.popleft()
+        if threshold and (len(joins) >= threshold or self.is_active(now)):
+            self.active_until = now + window
+        return self.is_active(now)
+
+    def is_active(self, now: float) -> bool:
+        return now < self.active_until
+
+    def is_collecting(self, now: float) -> bool:
+        if self.is_active(now):
+            return True
+        return self.summary_task is not None and not self.summary_task.done()
+
+
+class RejoinTracker:
+    """길드 하나에서 같은 미승인 봇이 ``window`` 초 안에 몇 번 들어왔는지 센다."""
+
+    def __init__(self, *, limit: int = REJOIN_TRACK_LIMIT):
+        self._joins: "OrderedDict[int, Deque[float]]" = OrderedDict()
+        self._limit = limit
+
+    def record(self, bot_id: int, now: float, window: float) -> int:
+        joins = self._joins.pop(bot_id, None) or deque()
+        joins.append(now)
+        while joins and now - joins[0] > window:
+            joins.popleft()
+        self._joins[bot_id] = joins
+        while len(self._joins) > self._limit:
+            self._joins.popitem(last=False)
+        return len(joins)
+
+    def forget(self, bot_id: int) -> None:
+        self._joins.pop(bot_id, None)
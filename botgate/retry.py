@@ -0,0 +1,97 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import aiohttp
+import discord
+
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 15.0
+# 킥/역할 라우트 버킷은 길드 단위라 재시도가 몰려도 길드당 동시 요청은 이 수를 넘지 않게 한다.
+GUILD_INFLIGHT_LIMIT = 4
+
+T = TypeVar("T")
+# (guild_id, 실패 예외, 다음 시도까지 대기 초)
+RetryCallback = Callable[[int, BaseException, float], Awaitable[None]]
+
+
+def is_transient(exc: BaseException) -> bool:
+    """다시 시도하면 성공할 수 있는 실패인지. 권한 없음(403)/대상 없음(404)은 영구 실패로 본다."""
+    if isinstance(exc, (discord.Forbidden, discord.NotFound)):
+        return False
+    if isinstance(exc, discord.RateLimited):
+        return True
+    if isinstance(exc, discord.HTTPException):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientError))
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """예외에 실린 Retry-After(초). 없으면 None"""
+    if isinstance(exc, discord.RateLimited):
+        return exc.retry_after
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryExecutor:
+    """모더레이션 REST 호출을 길드별 동시 실행 상한 아래에서 재시도한다.
+
+    일시적 실패(429/5xx/네트워크)는 지수 백오프에 full jitter를 더해 최대 ``attempts``번까지
+    다시 시도하고, Retry-After가 있으면 그보다 먼저 다시 보내지 않는다. Retry-After가
+    ``max_delay``보다 길면 기다리지 않고 바로 실패로 돌린다. 대기하는 동안에는 슬롯을 놓아
+    같은 길드의 다른 요청이 막히지 않게 한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        per_guild: int = GUILD_INFLIGHT_LIMIT,
+        on_retry: Optional[RetryCallback] = None,
+    ):
+        self._attempts = attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._per_guild = per_guild
+        self._on_retry = on_retry
+        self._slots: Dict[int, asyncio.Semaphore] = {}
+
+    async def run(self, guild_id: int, action: Callable[[], Awaitable[T]]) -> T:
+        slot = self._slots.get(guild_id)
+        if slot is None:
+            slot = asyncio.Semaphore(self._per_guild)
+            self._slots[guild_id] = slot
+        attempt = 0
+        while True:
+            attempt += 1
+            async with slot:
+                try:
+                    return await action()
+                except Exception as exc:
+                    if attempt >= self._attempts or not is_transient(exc):
+                        raise
+                    delay = self._delay(attempt, exc)
+                    if delay > self._max_delay:
+                        # 일찍 다시 보내면 또 429만 받는다.
+                        raise
+                    failure = exc
+            if self._on_retry is not None:
+                await self._on_retry(guild_id, failure, delay)
+            await asyncio.sleep(delay)
+
+    def _delay(self, attempt: int, exc: BaseException) -> float:
+        backoff = random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+        hint = retry_after(exc)
+        if hint is not None:
+            return max(hint, backoff)
+        return backoff
@@ -0,0 +1,116 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+SHARED_DB_NAME = "shared.sqlite3"
+SHARED_POLL_INTERVAL = 0.05
+SHARED_PRUNE_INTERVAL = 60.0
+EVENT_RETENTION_SECONDS = 60.0
+SQLITE_BUSY_TIMEOUT = 5.0
+
+# (kind, guild_id). guild_id가 None이면 전역 데이터(예: 전역 신뢰 목록) 변경
+SharedEvent = Tuple[str, Optional[int]]
+
+
+class SharedState:
+    """같은 호스트의 여러 샤드 프로세스가 SQLite(WAL) 파일 하나로 공유하는 상태
+
+    로그 쿨다운 시각과 캐시 무효화 이벤트를 담는다. 쿨다운 판정은 UPSERT 한 번으로
+    원자적으로 처리하고, 이벤트는 자동 증가 id를 기준으로 다른 프로세스가 폴링한다.
+    SQLite 호출은 전용 스레드 하나에서만 실행해 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.origin = uuid.uuid4().hex
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._last_event_id = 0
+
+    async def open(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="botgate-shared")
+        await self._run(self._open_sync)
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        try:
+            await self._run(self._close_sync)
+        finally:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def cooldown_hit(self, guild_id: int, bot_id: int, window: float) -> bool:
+        """``window`` 초 안에 어느 프로세스든 같은 (guild, bot) 로그를 보냈으면 True"""
+        return await self._run(self._cooldown_hit_sync, guild_id, bot_id, window)
+
+    async def publish(self, kind: str, guild_id: Optional[int] = None) -> None:
+        await self._run(self._publish_sync, kind, guild_id)
+
+    async def poll(self) -> List[SharedEvent]:
+        """마지막 폴링 이후 다른 프로세스가 올린 이벤트"""
+        return await self._run(self._poll_sync)
+
+    async def prune(self, cooldown_window: float) -> None:
+        await self._run(self._prune_sync, cooldown_window)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _open_sync(self) -> None:
+        conn = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cooldowns ("
+            "guild_id INTEGER NOT NULL, bot_id INTEGER NOT NULL, stamp REAL NOT NULL, "
+            "PRIMARY KEY (guild_id, bot_id))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT NOT NULL, kind TEXT NOT NULL, "
+            "guild_id INTEGER, created_at REAL NOT NULL)"
+        )
+        # 열기 전에 쌓인 이벤트는 cog_load에서 Config를 새로 읽었으므로 건너뛴다.
+        self._last_event_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        self._conn = conn
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _cooldown_hit_sync(self, guild_id: int, bot_id: int, window: float) -> bool:
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT INTO cooldowns (guild_id, bot_id, stamp) VALUES (?, ?, ?) "
+            "ON CONFLICT (guild_id, bot_id) DO UPDATE SET stamp = excluded.stamp "
+            "WHERE cooldowns.stamp <= ?",
+            (guild_id, bot_id, now, now - window),
+        )
+        return cursor.rowcount == 0
+
+    def _publish_sync(self, kind: str, guild_id: Optional[int]) -> None:
+        self._conn.execute(
+            "INSERT INTO events (origin, kind, guild_id, created_at) VALUES (?, ?, ?, ?)",
+            (self.origin, kind, guild_id, time.time()),
+        )
+
+    def _poll_sync(self) -> List[SharedEvent]:
+        rows = self._conn.execute(
+            "SELECT id, origin, kind, guild_id FROM events WHERE id > ? ORDER BY id",
+            (self._last_event_id,),
+        ).fetchall()
+        if not rows:
+            return []
+        self._last_event_id = rows[-1][0]
+        return [(kind, guild_id) for _, origin, kind, guild_id in rows if origin != self.origin]
+
+    def _prune_sync(self, cooldown_window: float) -> None:
+        now = time.time()
+        self._conn.execute("DELETE FROM events WHERE created_at < ?", (now - EVENT_RETENTION_SECONDS,))
+        self._conn.execute("DELETE FROM cooldowns WHERE stamp < ?", (now - cooldown_window,))
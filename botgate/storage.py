@@ -0,0 +1,574 @@
+import asyncio
+import glob
+import json
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import (
+    IO,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from redbot.core import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ALLOWLIST_GROUP = "ALLOWLIST"
+PENDING_GROUP = "PENDING"
+BANS_GROUP = "BANS"
+# 길드 행 옆에 같이 저장하는 저장 형식 버전 표시. 봇 ID와 겹치지 않는 키를 쓴다.
+SCHEMA_KEY = "_v"
+# 프로세스마다 이 이름에 pid를 붙인 파일을 쓴다. 예: writes.1234.journal
+JOURNAL_NAME = "writes.journal"
+WRITE_BEHIND_INTERVAL = 0.5
+# 길드 하나에서 이보다 많은 행이 바뀌었으면 행별 쓰기 대신 길드 전체를 한 번에 쓴다.
+ROW_WRITE_LIMIT = 16
+
+
+def _epoch(value: Union[int, float, str]) -> int:
+    try:
+        return int(float(value))
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
+
+
+class AllowRecord(NamedTuple):
+    """허용 목록 항목 하나. 저장 형식(v2)은 ``[approved_by, approved_at]`` 리스트다."""
+
+    approved_by: int
+    # epoch 초
+    approved_at: int
+
+    @classmethod
+    def decode(cls, raw: Any) -> "AllowRecord":
+        if isinstance(raw, dict):
+            # v1: {"approved_by": int, "approved_at": iso 문자열}
+            return cls(int(raw["approved_by"]), _epoch(raw["approved_at"]))
+        return cls(int(raw[0]), int(raw[1]))
+
+    def encode(self) -> List[int]:
+        return [self.approved_by, self.approved_at]
+
+
+class GuildKeyedStore:
+    """Config 커스텀 그룹(group, guild_id) 아래에 봇 ID를 키로 한 행을 하나씩 저장하는 저장소
+
+    메모리 인덱스(guild_id -> bot_id -> record)로 조회하고, 쓰기는 행 단위로 한다.
+    ``schema_version``이 있으면 길드마다 버전 표시를 같이 저장하고, 표시가 다른 길드는
+    처음 조회할 때 새 형식으로 풀어서 저널에 길드 전체 다시 쓰기를 예약한다.
+    """
+
+    group: str = ""
+    schema_version: Optional[int] = None
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.config.init_custom(self.group, 1)
+        self._index: Dict[int, Dict[int, Any]] = {}
+        # 아직 새 형식으로 풀지 않은 길드의 원본 행
+        self._stale: Dict[int, Dict[str, Any]] = {}
+        # Config에 현재 버전 표시가 있는 길드. 없는 길드는 행 단위로 쓰지 않고 길드 전체를 쓴다.
+        self._versioned: Set[int] = set()
+        # 길드별 변경 횟수. 정렬 인덱스 같은 파생 캐시가 무효화 여부를 판단하는 데 쓴다.
+        self._versions: Dict[int, int] = {}
+        # 연결되면 add/remove는 메모리만 바꾸고 Config 쓰기는 저널이 모아서 한다.
+        self.journal: Optional["WriteBehindJournal"] = None
+        # 길드별 Config 쓰기 순서를 지킨다. 길드 전체 교체가 끝나기 전에 행 쓰기가 먼저 반영되지 않게 한다.
+        self._write_locks: Dict[int, asyncio.Lock] = {}
+
+    def decode(self, raw: Any) -> Any:
+        return raw
+
+    def encode(self, record: Any) -> Any:
+        return record
+
+    async def load(self) -> None:
+        raw = await self.config.custom(self.group).all()
+        self._index = {}
+        self._stale = {}
+        self._versioned = set()
+        for guild_id in list(self._versions):
+            self._touch(guild_id)
+        for guild_key, rows in raw.items():
+            if self.schema_version is not None and rows.get(SCHEMA_KEY) != self.schema_version:
+                self._stale[int(guild_key)] = rows
+            else:
+                self._index[int(guild_key)] = self._decode_rows(rows)
+                self._versioned.add(int(guild_key))
+
+    async def reload_guild(self, guild_id: int) -> None:
+        """다른 프로세스가 바꾼 길드 하나를 Config에서 다시 읽는다."""
+        rows = await self._group(guild_id).all()
+        self._stale.pop(guild_id, None)
+        self._index[guild_id] = self._decode_rows(rows)
+        self._touch(guild_id)
+        if rows.get(SCHEMA_KEY) == self.schema_version:
+            self._versioned.add(guild_id)
+        else:
+            self._versioned.discard(guild_id)
+
+    def for_guild(self, guild_id: int) -> Dict[int, Any]:
+        entries = self._entries(guild_id)
+        if entries is None:
+            entries = {}
+            self._index[guild_id] = entries
+        return entries
+
+    def contains(self, guild_id: int, bot_id: int) -> bool:
+        entries = self._entries(guild_id)
+        return entries is not None and bot_id in entries
+
+    def get(self, guild_id: int, bot_id: int) -> Optional[Any]:
+        entries = self._entries(guild_id)
+        if entries is None:
+            return None
+        return entries.get(bot_id)
+
+    def count(self, guild_id: int) -> int:
+        return len(self._entries(guild_id) or ())
+
+    def guild_ids(self) -> Iterable[int]:
+        return set(self._index) | set(self._stale)
+
+    def version(self, guild_id: int) -> int:
+        return self._versions.get(guild_id, 0)
+
+    async def add(self, guild_id: int, bot_id: int, record: Any) -> None:
+        self.for_guild(guild_id)[bot_id] = record
+        self._touch(guild_id)
+        if self.journal is not None:
+            self.journal.record(self.group, guild_id, bot_id, self.encode(record))
+            return
+        await self.write_rows(guild_id, [bot_id])
+
+    async def remove(self, guild_id: int, bot_id: int) -> bool:
+        entries = self._entries(guild_id)
+        if not entries or bot_id not in entries:
+            return False
+        entries.pop(bot_id, None)
+        self._touch(guild_id)
+        if self.journal is not None:
+            self.journal.record(self.group, guild_id, bot_id, None)
+            return True
+        await self.write_rows(guild_id, [bot_id])
+        return True
+
+    async def replace_guild(self, guild_id: int, entries: Dict[int, Any]) -> None:
+        """길드 하나의 모든 행을 한 번의 쓰기로 교체한다.
+
+        메모리 인덱스는 await 전에 바꾸므로 쓰기 도중의 add/remove는 새 인덱스에 반영되고,
+        그 행은 저널에 남아 교체가 끝난 뒤 따로 쓰인다.
+        """
+        self._stale.pop(guild_id, None)
+        self._index[guild_id] = dict(entries)
+        self._touch(guild_id)
+        rows = self._encode_rows(entries)
+        if self.journal is not None:
+            # 지금까지 쌓인 행은 이번 교체가 모두 덮는다.
+            self.journal.discard(self.group, guild_id)
+        async with self._write_lock(guild_id):
+            try:
+                await self._group(guild_id).set(rows)
+            except Exception:
+                if self.journal is not None:
+                    self.journal.mark_guild(self.group, guild_id)
+                raise
+        self._versioned.add(guild_id)
+        if self.journal is not None:
+            # 교체 전에 남긴 줄이 파일에 남아 있으면 재시작 때 재생돼 교체를 되돌린다.
+            await self.journal.compact()
+
+    async def write_rows(self, guild_id: int, bot_ids: Iterable[int]) -> None:
+        """메모리 인덱스의 현재 값으로 ``bot_ids`` 행을 Config에 반영한다(없는 행은 지운다)."""
+        bot_ids = list(bot_ids)
+        if len(bot_ids) > ROW_WRITE_LIMIT or (
+            self.schema_version is not None and guild_id not in self._versioned
+        ):
+            await self.write_guild(guild_id)
+            return
+        group = self._group(guild_id)
+        async with self._write_lock(guild_id):
+            for bot_id in bot_ids:
+                record = self.get(guild_id, bot_id)
+                if record is not None:
+                    await group.set_raw(str(bot_id), value=self.encode(record))
+                else:
+                    await group.clear_raw(str(bot_id))
+
+    async def write_guild(self, guild_id: int) -> None:
+        async with self._write_lock(guild_id):
+            await self._group(guild_id).set(self._encode_rows(self.for_guild(guild_id)))
+        self._versioned.add(guild_id)
+
+    def encoded(self, guild_id: int, bot_id: int) -> Optional[Any]:
+        record = self.get(guild_id, bot_id)
+        return None if record is None else self.encode(record)
+
+    def apply(self, guild_id: int, bot_id: int, raw: Optional[Any]) -> None:
+        """저널 재생용. Config는 건드리지 않고 메모리 인덱스만 바꾼다."""
+        if raw is None:
+            self.for_guild(guild_id).pop(bot_id, None)
+        else:
+            self.for_guild(guild_id)[bot_id] = self.decode(raw)
+        self._touch(guild_id)
+
+    def _write_lock(self, guild_id: int) -> asyncio.Lock:
+        lock = self._write_locks.get(guild_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._write_locks[guild_id] = lock
+        return lock
+
+    def _touch(self, guild_id: int) -> None:
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+
+    def _entries(self, guild_id: int) -> Optional[Dict[int, Any]]:
+        entries = self._index.get(guild_id)
+        if entries is None and guild_id in self._stale:
+            entries = self._decode_rows(self._stale.pop(guild_id))
+            self._index[guild_id] = entries
+            if self.journal is not None:
+                self.journal.mark_guild(self.group, guild_id)
+        return entries
+
+    def _decode_rows(self, rows: Dict[str, Any]) -> Dict[int, Any]:
+        return {int(bot_key): self.decode(raw) for bot_key, raw in rows.items() if bot_key != SCHEMA_KEY}
+
+    def _encode_rows(self, entries: Dict[int, Any]) -> Dict[str, Any]:
+        rows: Dict[str, Any] = {str(bot_id): self.encode(record) for bot_id, record in entries.items()}
+        if self.schema_version is not None:
+            rows[SCHEMA_KEY] = self.schema_version
+        return rows
+
+    def _group(self, guild_id: int):
+        return self.config.custom(self.group, str(guild_id))
+
+
+class AllowlistStore(GuildKeyedStore):
+    """길드별 허용 목록. record = AllowRecord(approved_by, approved_at epoch 초)
+
+    v2 형식은 v1(dict 행)보다 저장 크기와 인덱스 메모리가 절반 정도지만, 로드 때 행마다
+    AllowRecord를 만드느라 인덱스 구축은 1.5~2배 느리다(1만 개 길드 기준 20~35ms -> 45~55ms,
+    ``bench.bench_allowlist``). 로드는 cog_load에서 한 번뿐이라 상주 메모리 쪽을 택했다.
+    """
+
+    group = ALLOWLIST_GROUP
+    schema_version = 2
+
+    def decode(self, raw: Any) -> AllowRecord:
+        return AllowRecord.decode(raw)
+
+    def encode(self, record: AllowRecord) -> List[int]:
+        return record.encode()
+
+    async def import_legacy(self, guild_id: int, entries: Dict[str, Dict[str, Any]]) -> None:
+        """길드 설정에 dict로 저장되던 예전 allowlist를 커스텀 그룹으로 옮긴다."""
+        current = dict(self.for_guild(guild_id))
+        for bot_key, raw in entries.items():
+            current.setdefault(int(bot_key), AllowRecord.decode(raw))
+        await self.replace_guild(guild_id, current)
+
+
+class PendingStore(GuildKeyedStore):
+    """승인 대기 중인 봇별 알림 목록
+
+    record = {"created_at": epoch 초, "alerts": [[channel_id, message_id], ...]}
+    channel_id는 예전 데이터에서 옮겨진 경우 None일 수 있다.
+    """
+
+    group = PENDING_GROUP
+
+    async def add_alert(
+        self,
+        guild_id: int,
+        bot_id: int,
+        channel_id: Optional[int],
+        message_id: int,
+        now: float,
+    ) -> bool:
+        existing = self.get(guild_id, bot_id)
+        alerts: List[List[Optional[int]]] = list(existing["alerts"]) if existing else []
+        if any(alert[1] == message_id for alert in alerts):
+            return False
+        alerts.append([channel_id, message_id])
+        created_at = existing["created_at"] if existing else now
+        await self.add(guild_id, bot_id, {"created_at": created_at, "alerts": alerts})
+        return True
+
+    def oldest(self, guild_id: int) -> Optional[int]:
+        entries = self._entries(guild_id)
+        if not entries:
+            return None
+        return min(entries, key=lambda bot_id: entries[bot_id]["created_at"])
+
+
+class BanStore(GuildKeyedStore):
+    """재입장 반복으로 임시 차단한 봇. record = {"until": 차단 해제 epoch 초}"""
+
+    group = BANS_GROUP
+
+    def expired(self, now: float) -> List[Tuple[int, int]]:
+        return [
+            (guild_id, bot_id)
+            for guild_id in self.guild_ids()
+            for bot_id, record in self.for_guild(guild_id).items()
+            if record["until"] <= now
+        ]
+
+    def next_expiry(self) -> Optional[float]:
+        return min(
+            (record["until"] for guild_id in self.guild_ids() for record in self.for_guild(guild_id).values()),
+            default=None,
+        )
+
+
+class WriteBehindJournal:
+    """GuildKeyedStore 쓰기를 모아 두었다가 한꺼번에 Config에 반영하는 write-behind 계층
+
+    변경은 먼저 추가 전용 JSONL 파일에 한 줄씩 남기고 (group, guild_id)별로 바뀐 봇 ID만
+    기록한다. ``flush()``는 같은 행에 대한 여러 변경을 마지막 값 하나로 합쳐 쓰고,
+    아직 반영되지 않은 행만 남기도록 저널 파일을 다시 쓴다. 반영 전에 프로세스가 죽으면
+    다음 ``open()``이 저널을 재생해 잃어버린 쓰기를 복구한다.
+
+    파일 I/O는 전용 스레드 하나에서 순서대로 처리해 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(
+        self,
+        *,
+        on_flush: Optional[Callable[[str, int], Awaitable[None]]] = None,
+    ):
+        self.path: Optional[str] = None
+        self._stores: Dict[str, GuildKeyedStore] = {}
+        self._dirty: Dict[Tuple[str, int], Set[int]] = {}
+        # 형식 변환 등으로 길드 전체를 다시 써야 하는 (group, guild_id)
+        self._full: Set[Tuple[str, int]] = set()
+        self._file: Optional[IO[str]] = None
+        self._on_flush = on_flush
+        # flush()가 지금 Config에 쓰고 있는 행
+        self._inflight: Dict[Tuple[str, int], Set[int]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 마지막으로 맡긴 파일 작업. close()가 이것까지 끝나기를 기다린다.
+        self._last_io: Optional[Future] = None
+        # 이 프로세스 저널의 잠금 파일과, 재생하려고 넘겨받은 다른 저널 -> 그 잠금 파일
+        self._lock: Optional[IO[str]] = None
+        self._adopted: Dict[str, IO[str]] = {}
+
+    @property
+    def pending(self) -> int:
+        return sum(len(bot_ids) for bot_ids in self._dirty.values()) + len(self._full)
+
+    def attach(self, store: GuildKeyedStore) -> None:
+        self._stores[store.group] = store
+        store.journal = self
+
+    async def open(self, path: str) -> int:
+        """``path``에 pid를 붙인 이 프로세스 전용 저널을 연다.
+
+        같은 데이터 폴더를 여러 프로세스가 함께 쓰면 서로의 줄을 compact()로 지우지 않도록
+        파일을 나눈다. 잠금이 풀린 채 남은 저널(죽은 프로세스의 것)은 모두 재생해 Config에
+        반영한 뒤 지운다. 재생한 줄 수를 돌려준다.
+        """
+        root, ext = os.path.splitext(path)
+        self.path = f"{root}.{os.getpid()}{ext}"
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="botgate-journal")
+        lines = await self._submit(self._read_and_open, path)
+        replayed = 0
+        for line in lines:
+            try:
+                group, guild_id, bot_id, raw = json.loads(line)
+            except ValueError:
+                # 쓰다가 죽은 마지막 줄
+                continue
+            store = self._stores.get(group)
+            if store is None:
+                continue
+            store.apply(guild_id, bot_id, raw)
+            self._dirty.setdefault((group, guild_id), set()).add(bot_id)
+            replayed += 1
+        try:
+            if replayed:
+                await self.flush()
+        finally:
+            # 반영하지 못한 행도 compact()로 이 프로세스 파일에 옮긴 뒤에야 남의 파일을 지운다.
+            await self.compact()
+            await self._submit(self._drop_adopted)
+        return replayed
+
+    def record(self, group: str, guild_id: int, bot_id: int, raw: Optional[Any]) -> None:
+        """이미 저장 형식으로 바꾼 값(``raw``, 삭제면 None)을 저널에 남긴다."""
+        if self._executor is not None:
+            self._last_io = self._executor.submit(
+                self._append, json.dumps([group, guild_id, bot_id, raw], separators=(",", ":")) + "\n"
+            )
+        self._dirty.setdefault((group, guild_id), set()).add(bot_id)
+
+    def mark_guild(self, group: str, guild_id: int) -> None:
+        self._full.add((group, guild_id))
+
+    def discard(self, group: str, guild_id: int) -> None:
+        """메모리의 미반영 행만 버린다. 파일의 기존 줄은 호출자가 쓰기를 마친 뒤 ``compact()``로 지운다."""
+        self._dirty.pop((group, guild_id), None)
+        self._full.discard((group, guild_id))
+
+    async def flush(self) -> None:
+        dirty, self._dirty = self._dirty, {}
+        full, self._full = self._full, set()
+        # 쓰는 도중에 다른 곳에서 compact()해도 아직 Config에 닿지 않은 행은 파일에 남긴다.
+        self._inflight = dirty
+        try:
+            for key in list(full):
+                group, guild_id = key
+                await self._stores[group].write_guild(guild_id)
+                full.discard(key)
+                dirty.pop(key, None)
+                if self._on_flush is not None:
+                    await self._on_flush(group, guild_id)
+            while dirty:
+                (group, guild_id), bot_ids = next(iter(dirty.items()))
+                await self._stores[group].write_rows(guild_id, bot_ids)
+                del dirty[(group, guild_id)]
+                if self._on_flush is not None:
+                    await self._on_flush(group, guild_id)
+        finally:
+            # 실패한 길드는 다음 주기에 다시 쓴다.
+            self._full.update(full)
+            for key, bot_ids in dirty.items():
+                self._dirty.setdefault(key, set()).update(bot_ids)
+            self._inflight = {}
+            await self.compact()
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        finally:
+            if self._executor is not None:
+                await self._submit(self._close_file)
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def compact(self) -> None:
+        """저널 파일을 아직 반영되지 않은 행의 현재 값만 담도록 다시 쓴다."""
+        if self._executor is None:
+            return
+        # 내용은 루프에서 찍어 두고 파일 교체만 스레드에 맡긴다. 이후 record()는 교체 뒤에 이어 붙는다.
+        rows: Dict[Tuple[str, int], Set[int]] = {key: set(bot_ids) for key, bot_ids in self._inflight.items()}
+        for key, bot_ids in self._dirty.items():
+            rows.setdefault(key, set()).update(bot_ids)
+        lines = [
+            json.dumps([group, guild_id, bot_id, self._stores[group].encoded(guild_id, bot_id)], separators=(",", ":"))
+            + "\n"
+            for (group, guild_id), bot_ids in rows.items()
+            for bot_id in bot_ids
+        ]
+        await self._submit(self._rewrite, lines)
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+        self._last_io = self._executor.submit(func, *args)
+        return asyncio.wrap_future(self._last_io)
+
+    # 아래는 저널 스레드에서만 호출한다.
+
+    def _read_and_open(self, path: str) -> List[str]:
+        self._lock = _try_lock(self.path)
+        if self._lock is None:
+            raise RuntimeError(f"{self.path} is locked by another process")
+        root, ext = os.path.splitext(path)
+        found = [p for p in glob.glob(f"{glob.escape(root)}.*{ext}") + [path] if p != self.path]
+        for other in found:
+            lock = _try_lock(other)
+            if lock is None:
+                # 살아 있는 다른 프로세스의 저널
+                continue
+            if os.path.exists(other):
+                self._adopted[other] = lock
+            else:
+                _unlock(lock)
+        lines: List[str] = []
+        # 오래된 파일부터 재생해 같은 행은 나중 값이 이긴다.
+        for source in sorted(list(self._adopted) + [self.path], key=_mtime):
+            if os.path.exists(source):
+                with open(source, encoding="utf-8") as fp:
+                    lines.extend(fp.readlines())
+        self._file = open(self.path, "a", encoding="utf-8")
+        return lines
+
+    def _append(self, line: str) -> None:
+        if self._file is not None:
+            self._file.write(line)
+            self._file.flush()
+
+    def _rewrite(self, lines: List[str]) -> None:
+        if self._file is None or self.path is None:
+            return
+        self._file.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            fp.writelines(lines)
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _drop_adopted(self) -> None:
+        for other, lock in self._adopted.items():
+            os.remove(other)
+            _unlock(lock)
+        self._adopted = {}
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._lock is not None and self.path is not None:
+            # 다 반영했으면 파일을 남기지 않는다. 남은 줄이 있으면 다음 open()이 넘겨받는다.
+            if os.path.exists(self.path) and os.path.getsize(self.path) == 0:
+                os.remove(self.path)
+            _unlock(self._lock)
+            self._lock = None
+        for lock in self._adopted.values():
+            lock.close()
+        self._adopted = {}
+
+
+def _try_lock(path: str) -> Optional[IO[str]]:
+    """``path`` 옆의 잠금 파일을 비차단으로 잡는다. 다른 프로세스가 잡고 있으면 None."""
+    fp = open(f"{path}.lock", "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fp.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        fp.close()
+        return None
+    return fp
+
+
+def _unlock(lock: IO[str]) -> None:
+    # 잡은 채로 지워야 다른 프로세스가 그 사이에 같은 잠금 파일을 새로 잡지 않는다.
+    try:
+        os.remove(lock.name)
+    except OSError:
+        # Windows는 열린 파일을 지우지 못한다. 남은 잠금 파일은 다음에 잡는 쪽이 그대로 쓴다.
+        pass
+    lock.close()
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
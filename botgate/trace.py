@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, Iterable, Optional
+
+TRACE_DIR = "traces"
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    """join/승인/명령 이벤트를 재생용 JSONL로 남긴다.
+
+    첫 줄은 ``{"k": "start"}`` 헤더로, 기록 시작 시점의 길드 설정과 허용 목록 스냅샷을 담는다.
+    이후 줄마다 ``t``(시작 후 초)와 ``k``(이벤트 종류)를 갖는다. 길드/봇/유저 ID는 기록마다 새로
+    만드는 비밀 키로 HMAC한 값만 남기므로 같은 기록 안에서는 일관되지만 원래 ID로 되돌릴 수 없다.
+
+    줄은 루프에서 만들고 파일 쓰기는 전용 스레드 하나에 순서대로 맡긴다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.events = 0
+        self._key = os.urandom(16)
+        self._started = time.monotonic()
+        self._file: Optional[IO[str]] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def anonymize(self, snowflake: int) -> int:
+        digest = hmac.new(self._key, str(snowflake).encode(), hashlib.sha256).digest()
+        # 실제 snowflake와 같은 크기(63비트)로 맞춰 재생 쪽 가짜 객체에 그대로 쓴다.
+        return int.from_bytes(digest[:8], "big") >> 1
+
+    async def start(self, guilds: Dict[int, Dict[str, Any]], trusted: Iterable[int]) -> None:
+        """``guilds``: guild_id -> {"enabled", "raid_threshold", "raid_window_seconds", "use_global_trust", "allow"}"""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="botgate-trace")
+        snapshot = {
+            str(self.anonymize(guild_id)): {
+                **settings,
+                "allow": [self.anonymize(bot_id) for bot_id in settings["allow"]],
+            }
+            for guild_id, settings in guilds.items()
+        }
+        header = {
+            "k": "start",
+            "v": TRACE_VERSION,
+            "guilds": snapshot,
+            "trusted": [self.anonymize(bot_id) for bot_id in trusted],
+        }
+        try:
+            await self._run(self._open, self._line(header))
+        except Exception:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+
+    def record(
+        self,
+        kind: str,
+        guild_id: int,
+        *,
+        bot_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        **fields: Any,
+    ) -> None:
+        if self._executor is None:
+            return
+        event: Dict[str, Any] = {
+            "t": round(time.monotonic() - self._started, 4),
+            "k": kind,
+            "g": self.anonymize(guild_id),
+        }
+        if bot_id is not None:
+            event["b"] = self.anonymize(bot_id)
+        if user_id is not None:
+            event["u"] = self.anonymize(user_id)
+        event.update(fields)
+        self._executor.submit(self._write, self._line(event))
+        self.events += 1
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        try:
+            # 앞서 맡긴 쓰기가 모두 끝난 뒤에 닫힌다.
+            await asyncio.wrap_future(executor.submit(self._close_file))
+        finally:
+            executor.shutdown(wait=False)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self._executor.submit(func, *args))
+
+    @staticmethod
+    def _line(event: Dict[str, Any]) -> str:
+        return json.dumps(event, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+    # 아래는 기록 스레드에서만 호출한다.
+
+    def _open(self, header: str) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._write(header)
+
+    def _write(self, line: str) -> None:
+        if self._file is not None:
+            self._file.write(line)
+            self._file.flush()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None